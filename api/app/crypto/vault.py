@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import os
 import base64
-from typing import Optional
+import asyncio
+from typing import Iterable, List, Optional, Union
 import httpx
 from dotenv import load_dotenv
 
@@ -12,6 +13,9 @@ load_dotenv()
 VAULT_ADDR = os.getenv("VAULT_ADDR")
 VAULT_TOKEN = os.getenv("VAULT_TOKEN")
 TRANSIT_MOUNT = os.getenv("VAULT_TRANSIT_MOUNT", "transit")
+# Cap on concurrent Transit requests issued by the *_many helpers
+VAULT_MAX_CONCURRENCY = int(os.getenv("VAULT_MAX_CONCURRENCY", "16"))
+_VAULT_SEM = asyncio.Semaphore(VAULT_MAX_CONCURRENCY)
 
 if not VAULT_ADDR or not VAULT_TOKEN:
     raise RuntimeError("VAULT_ADDR and VAULT_TOKEN must be set in .env")
@@ -21,6 +25,37 @@ _HEADERS = {
     "Content-Type": "application/json",
 }
 
+# Shared client so Transit calls reuse pooled keep-alive connections instead
+# of opening (and TLS-handshaking) a new connection per encrypt/decrypt.
+# Pools are tied to the event loop they were created on, so a client is
+# rebuilt if it is used from a different loop.
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if _client is not None and not _client.is_closed:
+            if _client_loop is not None and _client_loop.is_running():
+                # Stale client from a loop that is still alive (another thread):
+                # close it on that loop, where its connections live
+                asyncio.run_coroutine_threadsafe(_client.aclose(), _client_loop)
+            # Otherwise its loop has stopped or closed, taking the connection
+            # transports with it; aclose() can't be awaited there, so the
+            # client is just dropped
+        _client = httpx.AsyncClient(timeout=15.0)
+        _client_loop = loop
+    return _client
+
+async def close_client() -> None:
+    """Close the shared Vault HTTP client (call on application shutdown)."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
 def _enc_path(key_name: str) -> str:
     # POST /v1/transit/encrypt/<key>
     return f"{VAULT_ADDR}/v1/{TRANSIT_MOUNT}/encrypt/{key_name}"
@@ -44,16 +79,15 @@ async def encrypt_text(key_path: str, plaintext: str, context: Optional[str] = N
     if context:
         body["context"] = base64.b64encode(context.encode("utf-8")).decode("ascii")
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.post(_enc_path(key_name), headers=_HEADERS, json=body)
-        try:
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            # Help debugging: include Vault error body
-            raise RuntimeError(f"Vault encrypt failed: {e.response.status_code} {e.response.text}") from e
-        data = resp.json()
-        cipher = data["data"]["ciphertext"]  # e.g. 'vault:v1:...'
-        return cipher.encode("utf-8")
+    resp = await _get_client().post(_enc_path(key_name), headers=_HEADERS, json=body)
+    try:
+        resp.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        # Help debugging: include Vault error body
+        raise RuntimeError(f"Vault encrypt failed: {e.response.status_code} {e.response.text}") from e
+    data = resp.json()
+    cipher = data["data"]["ciphertext"]  # e.g. 'vault:v1:...'
+    return cipher.encode("utf-8")
 
 async def decrypt_text(key_path: str, ciphertext_bytes: bytes, context: Optional[str] = None) -> str:
     """
@@ -65,12 +99,41 @@ async def decrypt_text(key_path: str, ciphertext_bytes: bytes, context: Optional
     if context:
         body["context"] = base64.b64encode(context.encode("utf-8")).decode("ascii")
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        resp = await client.post(_dec_path(key_name), headers=_HEADERS, json=body)
-        try:
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            raise RuntimeError(f"Vault decrypt failed: {e.response.status_code} {e.response.text}") from e
-        data = resp.json()
-        pt_b64 = data["data"]["plaintext"]
-        return base64.b64decode(pt_b64.encode("ascii")).decode("utf-8")
+    resp = await _get_client().post(_dec_path(key_name), headers=_HEADERS, json=body)
+    try:
+        resp.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        raise RuntimeError(f"Vault decrypt failed: {e.response.status_code} {e.response.text}") from e
+    data = resp.json()
+    pt_b64 = data["data"]["plaintext"]
+    return base64.b64decode(pt_b64.encode("ascii")).decode("utf-8")
+
+async def encrypt_many(key_path: str, plaintexts: Iterable[str]) -> List[bytes]:
+    """
+    Encrypt several plaintexts concurrently, with at most VAULT_MAX_CONCURRENCY
+    requests in flight. Ciphertexts are returned in input order.
+    """
+    async def _one(plaintext: str) -> bytes:
+        async with _VAULT_SEM:
+            return await encrypt_text(key_path, plaintext)
+
+    return list(await asyncio.gather(*(_one(pt) for pt in plaintexts)))
+
+async def decrypt_many(
+    key_path: str,
+    ciphertexts: Iterable[bytes],
+    return_exceptions: bool = False,
+) -> List[Union[str, BaseException]]:
+    """
+    Decrypt several ciphertexts concurrently, with at most VAULT_MAX_CONCURRENCY
+    requests in flight. Plaintexts are returned in input order; with
+    return_exceptions, a failed decrypt yields its exception in its place.
+    """
+    async def _one(ciphertext: bytes) -> str:
+        async with _VAULT_SEM:
+            return await decrypt_text(key_path, ciphertext)
+
+    return list(await asyncio.gather(
+        *(_one(ct) for ct in ciphertexts),
+        return_exceptions=return_exceptions,
+    ))
@@ -57,6 +57,21 @@ else:
 # Anthropic always uses direct API
 anthropic_client = AsyncAnthropic(api_key=ANTHROPIC_API_KEY) if ANTHROPIC_API_KEY else None
 
+_RULE = "=" * 80
+_MESSAGE_RULE = "-" * 80
+
+
+def _log_chatgpt_input(model: str, messages: list[dict]) -> None:
+    """Log the prompt as a single record (one handler write, not three per message)."""
+    if not log.isEnabledFor(logging.INFO):
+        return
+    parts = [_RULE, f"🤖 CHATGPT INPUT (model: {model})", _RULE]
+    for i, msg in enumerate(messages, 1):
+        parts.append(f"[{i}] {msg.get('role', '?').upper()}:")
+        parts.append(f"{msg.get('content', '')}")
+        parts.append(_MESSAGE_RULE)
+    log.info("%s", "\n".join(parts))
+
 
 async def call_openai(messages: list[dict], model: str = None, json_mode: bool = False) -> dict:
     """Call OpenAI API with optional JSON mode."""
@@ -70,15 +85,7 @@ async def call_openai(messages: list[dict], model: str = None, json_mode: bool =
         model = model or OPENAI_MODEL
 
     # Log input to ChatGPT
-    log.info("=" * 80)
-    log.info("🤖 CHATGPT INPUT (model: %s)", model)
-    log.info("=" * 80)
-    for i, msg in enumerate(messages, 1):
-        role = msg.get("role", "?").upper()
-        content = msg.get("content", "")
-        log.info("[%d] %s:", i, role)
-        log.info("%s", content)
-        log.info("-" * 80)
+    _log_chatgpt_input(model, messages)
 
     start = time.time()
     try:
@@ -100,16 +107,15 @@ async def call_openai(messages: list[dict], model: str = None, json_mode: bool =
 
         response_text = response.choices[0].message.content or ""
 
-        # Log output from ChatGPT
-        log.info("=" * 80)
-        log.info("🤖 CHATGPT OUTPUT (latency: %dms, tokens: %d in / %d out)",
+        # Log output from ChatGPT as a single record
+        log.info("%s\n🤖 CHATGPT OUTPUT (latency: %dms, tokens: %d in / %d out)\n%s\n%s\n%s\n",
+                 _RULE,
                  elapsed_ms,
                  response.usage.prompt_tokens if response.usage else 0,
-                 response.usage.completion_tokens if response.usage else 0)
-        log.info("=" * 80)
-        log.info("%s", response_text)
-        log.info("=" * 80)
-        log.info("")
+                 response.usage.completion_tokens if response.usage else 0,
+                 _RULE,
+                 response_text,
+                 _RULE)
 
         return {
             "provider": "openai",
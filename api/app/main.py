@@ -50,6 +50,12 @@ async def startup_event():
         logger.error(f"Failed to initialize Azure AI Search RAG service: {e}")
         # Don't fail the app startup, just log the error
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled Vault connections"""
+    from .crypto.vault import close_client
+    await close_client()
+
 # CORS for dev (adjust origins for prod)
 app.add_middleware(
     CORSMiddleware,
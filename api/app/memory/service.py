@@ -1,15 +1,18 @@
 from __future__ import annotations
 import hashlib
+import re
 from typing import List, Tuple
 from sqlalchemy import text
 from ..db import member_session
-from ..crypto.vault import encrypt_text, decrypt_text
+from ..crypto.vault import encrypt_text, encrypt_many, decrypt_text, decrypt_many
 
 # Config knobs
 SUMMARY_EVERY_N_MESSAGES = 5
 MAX_RECENT_MESSAGES = 6
 MAX_FACTS = 20
 
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
 async def get_last_messages(schema: str, key_id: str, thread_id: str, limit: int = MAX_RECENT_MESSAGES) -> List[Tuple[str,str]]:
     async with member_session(schema) as s:
         r = await s.execute(
@@ -23,10 +26,9 @@ async def get_last_messages(schema: str, key_id: str, thread_id: str, limit: int
             {"tid": thread_id, "lim": limit},
         )
         rows = r.fetchall()
-    out: List[Tuple[str,str]] = []
-    for role, enc in reversed(rows):
-        out.append((role, await decrypt_text(key_id, enc)))
-    return out
+    rows.reverse()
+    contents = await decrypt_many(key_id, [enc for _, enc in rows])
+    return [(role, content) for (role, _), content in zip(rows, contents)]
 
 async def get_thread_summary(schema: str, key_id: str, thread_id: str) -> Tuple[str,int] | None:
     async with member_session(schema) as s:
@@ -62,11 +64,10 @@ async def list_recent_facts(schema: str, key_id: str, limit: int = MAX_FACTS) ->
             {"lim": limit},
         )
         rows = r.fetchall()
-    return [await decrypt_text(key_id, enc) for (enc,) in rows]
+    return await decrypt_many(key_id, [enc for (enc,) in rows])
 
 def _quick_fact_candidates(plain_text: str) -> list[str]:
-    import re
-    sents = re.split(r'(?<=[.!?])\s+', plain_text.strip())
+    sents = _SENTENCE_SPLIT_RE.split(plain_text.strip())
     cands: list[str] = []
     for s in sents:
         s2 = s.strip()
@@ -78,18 +79,22 @@ async def add_facts(schema: str, key_id: str, source: str, plain_text: str) -> i
     cands = _quick_fact_candidates(plain_text)
     if not cands:
         return 0
+    # Encrypt (concurrently) before opening the session so no connection is
+    # held across Vault calls, then insert every fact in one executemany
+    encs = await encrypt_many(key_id, cands)
+    rows = [
+        {"h": hashlib.sha256(c.encode("utf-8")).hexdigest(), "e": enc, "src": source}
+        for c, enc in zip(cands, encs)
+    ]
     async with member_session(schema) as s:
-        for c in cands:
-            h = hashlib.sha256(c.encode("utf-8")).hexdigest()
-            enc = await encrypt_text(key_id, c)
-            await s.execute(
-                text("""
-                    INSERT INTO memory_facts (fact_hash, fact_enc, source)
-                    VALUES (:h, :e, :src)
-                    ON CONFLICT (fact_hash) DO NOTHING
-                """),
-                {"h": h, "e": enc, "src": source},
-            )
+        await s.execute(
+            text("""
+                INSERT INTO memory_facts (fact_hash, fact_enc, source)
+                VALUES (:h, :e, :src)
+                ON CONFLICT (fact_hash) DO NOTHING
+            """),
+            rows,
+        )
         await s.commit()
     return len(cands)
 
@@ -7,13 +7,27 @@ EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 PHONE = re.compile(r"(?:\+?\d[\d\s().-]{7,}\d)")
 IBAN  = re.compile(r"\b[A-Z]{2}\d{2}[A-Z0-9]{11,30}\b")
 PT_NIF = re.compile(r"\b\d{9}\b")
+DIGIT = re.compile(r"\d")
+
+# All patterns as one alternation so the text is scanned once; at a given
+# position earlier alternatives win (email before phone before NIF), and a
+# phone number may not end inside the local part of an email address
+PII = re.compile(
+    rf"(?P<EMAIL>{EMAIL.pattern})"
+    rf"|(?P<IBAN>{IBAN.pattern})"
+    rf"|(?P<PHONE>{PHONE.pattern}(?![A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Za-z]{{2,}}))"
+    rf"|(?P<PT_TAX>{PT_NIF.pattern})"
+)
+_PII_LABELS = {name: f"[{name}]" for name in PII.groupindex}
+
+def _pii_label(match: re.Match) -> str:
+    return _PII_LABELS[match.lastgroup]
 
 def sanitize(text: str) -> str:
     """
     Minimal DEV sanitizer. Replace with Presidio/spaCy later.
+    Every pattern needs an '@' or a digit, so text with neither is returned as-is.
     """
-    t = EMAIL.sub("[EMAIL]", text)
-    t = PHONE.sub("[PHONE]", t)
-    t = IBAN.sub("[IBAN]", t)
-    t = PT_NIF.sub("[PT_TAX]", t)
-    return t
+    if "@" not in text and DIGIT.search(text) is None:
+        return text
+    return PII.sub(_pii_label, text)
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import os
 import re
+import asyncio
 import json
 import logging
 
@@ -12,7 +13,7 @@ from sqlalchemy import text
 
 from ..security import get_identity, Identity
 from ..db import fetch_member_mapping, member_session
-from ..crypto.vault import encrypt_text, decrypt_text
+from ..crypto.vault import encrypt_text, decrypt_text, decrypt_many
 from ..llm.clients import fanout_with_history
 from ..utils.debug import debug_enabled
 from ..utils.document_processor import expand_unchanged_sections, extract_clean_response
@@ -32,6 +33,9 @@ MAX_DOC_CHARS = int(os.getenv("MAX_DOC_CHARS", "24000"))
 RAG_TOP_K = int(os.getenv("RAG_TOP_K", "15"))
 RAG_MIN_SIM = float(os.getenv("RAG_MIN_SIMILARITY", "0.7"))
 
+_CURRENT_DOC_RE = re.compile(r'<current_document>\n(.*?)\n</current_document>', re.DOTALL)
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
 class CompareIn(BaseModel):
     thread_id: str
     message_id: str
@@ -81,11 +85,7 @@ async def _load_all_user_messages(schema: str, key_id: str, thread_id: str) -> l
         """), {"tid": thread_id})
         rows = r.all()
 
-    out = []
-    for (enc,) in rows:
-        content = await decrypt_text(key_id, enc)
-        out.append(content)
-    return out
+    return await decrypt_many(key_id, [enc for (enc,) in rows])
 
 
 async def _load_sanitized_message(schema: str, key_id: str, message_id: str) -> str:
@@ -163,17 +163,21 @@ async def _get_file_context(schema: str, key_id: str, thread_id: str) -> str:
     if not files:
         return ""
 
-    # Build the file context block
+    # Build the file context block; decrypt all files at once, skipping any that fail
+    contents = await decrypt_many(
+        key_id,
+        [content_enc for _, _, content_enc in files],
+        return_exceptions=True,
+    )
     file_blocks = []
-    for file_id, filename, content_enc in files:
-        try:
-            # Decrypt file content
-            content = await decrypt_text(key_id, content_enc)
-            # Add to the block with proper XML formatting
-            file_blocks.append(f"<file name='{filename}'>\n{content}\n</file>")
-        except Exception as e:
-            log.warning(f"Failed to decrypt file {file_id} ({filename}): {e}")
+    for (file_id, filename, _), content in zip(files, contents):
+        if isinstance(content, asyncio.CancelledError):
+            raise content
+        if isinstance(content, BaseException):
+            log.warning(f"Failed to decrypt file {file_id} ({filename}): {content}")
             continue
+        # Add to the block with proper XML formatting
+        file_blocks.append(f"<file name='{filename}'>\n{content}\n</file>")
 
     if not file_blocks:
         return ""
@@ -234,9 +238,11 @@ async def _get_rag_context(
         if not chunks:
             return ""
 
-        # Format chunks for LLM
-        rag_text = "<retrieved_context>\n"
-        rag_text += "The following information was retrieved from uploaded documents:\n\n"
+        # Format chunks for LLM (collect parts, join once)
+        parts = [
+            "<retrieved_context>\n",
+            "The following information was retrieved from uploaded documents:\n\n",
+        ]
 
         for i, chunk in enumerate(chunks, 1):
             filename = chunk.get("filename", "unknown")
@@ -253,12 +259,11 @@ async def _get_rag_context(
                 citation += f" [Section: {section_header}]"
             citation += f" (relevance: {score:.2f})"
             
-            rag_text += f"{citation}\n"
-            rag_text += f"{content}\n\n"
+            parts.append(f"{citation}\n{content}\n\n")
 
-        rag_text += "</retrieved_context>"
+        parts.append("</retrieved_context>")
 
-        return rag_text
+        return "".join(parts)
 
     except Exception as e:
         log.error(f"RAG retrieval failed: {e}")
@@ -366,11 +371,11 @@ async def compare(body: CompareIn, idn: Identity = Depends(get_identity)):
     if all_user_msgs:
         history_msgs = all_user_msgs[:-1]
         if history_msgs:
-            history_text = "Previous requests in this thread:\n"
+            history_parts = ["Previous requests in this thread:\n"]
             for i, msg in enumerate(history_msgs, 1):
                 preview = msg[:200] + "..." if len(msg) > 200 else msg
-                history_text += f'{i}. "{preview}"\n'
-            messages.append({"role": "system", "content": history_text})
+                history_parts.append(f'{i}. "{preview}"\n')
+            messages.append({"role": "system", "content": "".join(history_parts)})
 
     # Current document (if any)
     doc_block = await _current_document_block(schema, key_id, body.thread_id)
@@ -433,7 +438,7 @@ async def compare(body: CompareIn, idn: Identity = Depends(get_identity)):
     # If we had a current doc, try to expand placeholders / apply structured edits
     doc_content = None
     if doc_block:
-        match = re.search(r'<current_document>\n(.*?)\n</current_document>', doc_block, re.DOTALL)
+        match = _CURRENT_DOC_RE.search(doc_block)
         if match:
             doc_content = match.group(1)
 
@@ -453,7 +458,7 @@ async def compare(body: CompareIn, idn: Identity = Depends(get_identity)):
                 expanded_text = cleaned_text
             elif use_structured_edits and doc_content:
                 try:
-                    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', cleaned_text, re.DOTALL)
+                    json_match = _JSON_BLOCK_RE.search(cleaned_text)
                     json_str = json_match.group(1) if json_match else cleaned_text
                     parsed_plan = EditPlan.model_validate_json(json_str)
 
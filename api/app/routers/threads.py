@@ -10,7 +10,7 @@ from sqlalchemy import text
 
 from ..security import get_identity, Identity
 from ..db import fetch_member_mapping, member_session
-from ..crypto.vault import encrypt_text, decrypt_text
+from ..crypto.vault import encrypt_text, decrypt_text, decrypt_many
 from ..privacy.sanitize import sanitize
 
 router = APIRouter(prefix="/threads", tags=["threads"])
@@ -281,11 +281,12 @@ async def list_messages(thread_id: str, idn: Identity = Depends(get_identity)):
             {"tid": thread_id}
         )
         rows = r.all()
-    for i, role, san_enc, ts in rows:
+    contents = await decrypt_many(key_id, [san_enc for _, _, san_enc, _ in rows])
+    for (i, role, _, ts), content in zip(rows, contents):
         out.append({
             "id": str(i),
             "role": "assistant" if role == "system" else role,
-            "sanitized": await decrypt_text(key_id, san_enc),
+            "sanitized": content,
             "ts": ts.isoformat()
         })
     return {"items": out}
@@ -9,9 +9,12 @@ Architecture:
 """
 
 import os
+import re
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
 from azure.search.documents import SearchClient
@@ -56,9 +59,15 @@ EMBEDDING_DIMENSIONS = 1536  # text-embedding-ada-002 dimensions
 EMBEDDING_BATCH_SIZE = int(os.getenv("AZURE_OPENAI_EMBEDDING_BATCH_SIZE", "16"))
 EMBEDDING_MAX_RETRIES = int(os.getenv("AZURE_OPENAI_EMBEDDING_MAX_RETRIES", "5"))
 EMBEDDING_RETRY_DELAY = float(os.getenv("AZURE_OPENAI_EMBEDDING_RETRY_DELAY", "2"))
+SEARCH_POOL_WORKERS = int(os.getenv("AZURE_SEARCH_POOL_WORKERS", "2"))
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "256"))
+CHUNK_ENCODE_THREADS = int(os.getenv("CHUNK_ENCODE_THREADS", str(os.cpu_count() or 1)))
 
+# Sentence separator: whitespace following . ! or ?
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
 
-@dataclass
+
+@dataclass(slots=True)
 class DocumentChunk:
     """Represents a chunk of text with metadata"""
     content: str
@@ -77,102 +86,112 @@ class LocalChunker:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4 encoding
+        # Paragraph separator tokens, so joined pieces are counted without re-encoding
+        self._sep_tokens = self.encoding.encode_ordinary('\n\n')
 
     def chunk_text(self, text: str) -> List[DocumentChunk]:
         """
         Chunk text using semantic boundaries and token-based splitting.
         Now supports Markdown header tracking for better context.
+        Pieces are kept as (text, tokens) pairs so overlap and counts reuse
+        the tokens already computed for each paragraph and sentence.
         """
         chunks = []
 
-        # Split into paragraphs
-        paragraphs = text.split('\n\n')
-
         current_chunk = []
         current_tokens = 0
-        char_position = 0
         chunk_start_char = 0
+        chunk_end_char = 0
         chunk_index = 0
         current_header = None
-        
-        # Helper to check for headers
-        def get_header(text: str) -> Optional[str]:
-            lines = text.split('\n')
-            for line in lines:
-                if line.strip().startswith('#'):
-                    return line.strip().lstrip('#').strip()
-            return None
-
-        for para in paragraphs:
-            para = para.strip()
+
+        paragraphs = []
+        for para_start, para_end in self._paragraph_bounds(text):
+            raw_para = text[para_start:para_end]
+            para = raw_para.strip()
             if not para:
                 continue
-            
-            # Check if paragraph contains a header
-            new_header = get_header(para)
-            if new_header:
-                current_header = new_header
+            para_start += len(raw_para) - len(raw_para.lstrip())
+            paragraphs.append((para, para_start, para_start + len(para)))
+
+        # Tokenize every distinct paragraph in one call; tiktoken spreads the
+        # batch over threads with the GIL released. Repeated paragraphs (page
+        # headers and footers of extracted PDFs, boilerplate) are encoded once
+        distinct = list(dict.fromkeys(para for para, _, _ in paragraphs))
+        tokens_by_para = dict(zip(distinct, self._encode_batch(distinct)))
+
+        for para, para_start, para_end in paragraphs:
+            para_tokens = tokens_by_para[para]
+            # Check if paragraph contains a header (most paragraphs have no '#')
+            if '#' in para:
+                new_header = self._get_header(para)
+                if new_header:
+                    current_header = new_header
 
-            para_tokens = self.encoding.encode(para)
             para_token_count = len(para_tokens)
 
             # If single paragraph is too large, split by sentences
             if para_token_count > self.chunk_size:
                 # Save current chunk if exists
                 if current_chunk:
-                    chunk_text = '\n\n'.join(current_chunk)
+                    chunk_text = '\n\n'.join(piece for piece, _ in current_chunk)
                     chunks.append(DocumentChunk(
                         content=chunk_text,
                         chunk_index=chunk_index,
                         token_count=current_tokens,
                         char_start=chunk_start_char,
-                        char_end=char_position,
+                        char_end=chunk_end_char,
                         section_header=current_header
                     ))
                     chunk_index += 1
 
                 # Split large paragraph by sentences
-                sentences = self._split_sentences(para)
                 sentence_chunk = []
                 sentence_tokens = 0
-                sentence_start = char_position
+                sentence_start = para_start
+                sentence_end = para_start
+
+                sentence_bounds = self._sentence_bounds(para)
+                tokens_per_sentence = self._encode_batch(
+                    [para[sent_start:sent_end] for sent_start, sent_end in sentence_bounds]
+                )
 
-                for sentence in sentences:
-                    sent_tokens = self.encoding.encode(sentence)
+                for (sent_start, sent_end), sent_tokens in zip(sentence_bounds, tokens_per_sentence):
+                    sentence = para[sent_start:sent_end]
                     sent_token_count = len(sent_tokens)
 
                     if sentence_tokens + sent_token_count > self.chunk_size and sentence_chunk:
                         # Save sentence chunk
-                        chunk_text = ' '.join(sentence_chunk)
+                        chunk_text = ' '.join(piece for piece, _ in sentence_chunk)
                         chunks.append(DocumentChunk(
                             content=chunk_text,
                             chunk_index=chunk_index,
                             token_count=sentence_tokens,
                             char_start=sentence_start,
-                            char_end=char_position,
+                            char_end=sentence_end,
                             section_header=current_header
                         ))
                         chunk_index += 1
 
                         # Add overlap from previous chunk
-                        overlap_text = self._get_overlap_text(sentence_chunk, self.chunk_overlap)
-                        sentence_chunk = [overlap_text] if overlap_text else []
-                        sentence_tokens = len(self.encoding.encode(' '.join(sentence_chunk)))
-                        sentence_start = char_position
+                        overlap = self._get_overlap(sentence_chunk, self.chunk_overlap)
+                        sentence_chunk = [overlap] if overlap[0] else []
+                        sentence_tokens = len(overlap[1]) if overlap[0] else 0
+                        sentence_start = para_start + sent_start
 
-                    sentence_chunk.append(sentence)
+                    sentence_chunk.append((sentence, sent_tokens))
                     sentence_tokens += sent_token_count
-                    char_position += len(sentence) + 1
+                    sentence_end = para_start + sent_end
 
                 # Save remaining sentences
                 if sentence_chunk:
-                    chunk_text = ' '.join(sentence_chunk)
+                    chunk_text = ' '.join(piece for piece, _ in sentence_chunk)
                     chunks.append(DocumentChunk(
                         content=chunk_text,
                         chunk_index=chunk_index,
                         token_count=sentence_tokens,
                         char_start=sentence_start,
-                        char_end=char_position,
+                        char_end=sentence_end,
                         section_header=current_header
                     ))
                     chunk_index += 1
@@ -180,67 +199,133 @@ class LocalChunker:
                 # Reset for next paragraph
                 current_chunk = []
                 current_tokens = 0
-                chunk_start_char = char_position
 
             # Normal case: paragraph fits in chunk
             elif current_tokens + para_token_count > self.chunk_size and current_chunk:
                 # Save current chunk
-                chunk_text = '\n\n'.join(current_chunk)
+                chunk_text = '\n\n'.join(piece for piece, _ in current_chunk)
                 chunks.append(DocumentChunk(
                     content=chunk_text,
                     chunk_index=chunk_index,
                     token_count=current_tokens,
                     char_start=chunk_start_char,
-                    char_end=char_position,
+                    char_end=chunk_end_char,
                     section_header=current_header
                 ))
                 chunk_index += 1
 
                 # Start new chunk with overlap
-                overlap_text = self._get_overlap_text(current_chunk, self.chunk_overlap)
-                current_chunk = [overlap_text, para] if overlap_text else [para]
-                current_tokens = len(self.encoding.encode('\n\n'.join(current_chunk)))
-                chunk_start_char = char_position
+                overlap = self._get_overlap(current_chunk, self.chunk_overlap)
+                if overlap[0]:
+                    current_chunk = [overlap, (para, para_tokens)]
+                    current_tokens = len(overlap[1]) + len(self._sep_tokens) + para_token_count
+                else:
+                    current_chunk = [(para, para_tokens)]
+                    current_tokens = para_token_count
+                chunk_start_char = para_start
+                chunk_end_char = para_end
 
             else:
                 # Add to current chunk
-                current_chunk.append(para)
+                if not current_chunk:
+                    chunk_start_char = para_start
+                current_chunk.append((para, para_tokens))
                 current_tokens += para_token_count
-
-            char_position += len(para) + 2  # +2 for \n\n
+                chunk_end_char = para_end
 
         # Save final chunk
         if current_chunk:
-            chunk_text = '\n\n'.join(current_chunk)
+            chunk_text = '\n\n'.join(piece for piece, _ in current_chunk)
             chunks.append(DocumentChunk(
                 content=chunk_text,
                 chunk_index=chunk_index,
                 token_count=current_tokens,
                 char_start=chunk_start_char,
-                char_end=char_position,
+                char_end=chunk_end_char,
                 section_header=current_header
             ))
 
         log.info(f"Chunked text into {len(chunks)} chunks (avg {sum(c.token_count for c in chunks) / len(chunks) if chunks else 0:.0f} tokens/chunk)")
         return chunks
 
-    def _split_sentences(self, text: str) -> List[str]:
-        """Split text into sentences using basic punctuation rules"""
-        import re
-        # Split on . ! ? followed by space or end of string
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
-
-    def _get_overlap_text(self, chunks: List[str], overlap_tokens: int) -> str:
-        """Get last N tokens from chunks as overlap text"""
-        combined = '\n\n'.join(chunks)
-        tokens = self.encoding.encode(combined)
-
-        if len(tokens) <= overlap_tokens:
-            return combined
-
-        overlap_token_list = tokens[-overlap_tokens:]
-        return self.encoding.decode(overlap_token_list)
+    def _encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """
+        Encode texts in a single threaded tiktoken batch. Uploaded documents are
+        plain text, so special-token strings like "<|endoftext|>" are encoded as
+        ordinary text; this also skips the special-token scan of every input.
+        """
+        if not texts:
+            return []
+        return self.encoding.encode_ordinary_batch(texts, num_threads=CHUNK_ENCODE_THREADS)
+
+    @staticmethod
+    def _get_header(text: str) -> Optional[str]:
+        """Return the text of the first Markdown header line in text, if any"""
+        for line in text.split('\n'):
+            line = line.strip()
+            if line.startswith('#'):
+                return line.lstrip('#').strip()
+        return None
+
+    @staticmethod
+    def _paragraph_bounds(text: str) -> List[Tuple[int, int]]:
+        """Return (start, end) offsets of the blank-line separated paragraphs in text"""
+        bounds = []
+        i = 0
+        n = len(text)
+        while i < n:
+            j = text.find('\n\n', i)
+            if j < 0:
+                bounds.append((i, n))
+                break
+            bounds.append((i, j))
+            i = j + 2
+        return bounds
+
+    @staticmethod
+    def _sentence_bounds(text: str) -> List[Tuple[int, int]]:
+        """
+        Return (start, end) offsets of the sentences in a stripped paragraph,
+        using basic punctuation rules. Offsets come from the separator matches
+        themselves, so no sentence has to be searched for afterwards.
+        """
+        bounds = []
+        start = 0
+        for match in _SENTENCE_SPLIT_RE.finditer(text):
+            bounds.append((start, match.start()))
+            start = match.end()
+        if start < len(text):
+            bounds.append((start, len(text)))
+        return bounds
+
+    def _get_overlap(
+        self,
+        pieces: List[Tuple[str, List[int]]],
+        overlap_tokens: int
+    ) -> Tuple[str, List[int]]:
+        """
+        Get the last N tokens of the '\n\n'-joined pieces as an overlap
+        (text, tokens) pair. Walks back over the cached token lists only as
+        far as needed and decodes once, instead of re-encoding the chunk.
+        """
+        sep_tokens = self._sep_tokens
+        tail = []
+        count = 0
+        for i in range(len(pieces) - 1, -1, -1):
+            tail.append(pieces[i][1])
+            count += len(pieces[i][1])
+            if count > overlap_tokens:
+                break
+            if i:
+                tail.append(sep_tokens)
+                count += len(sep_tokens)
+        else:
+            # The whole chunk fits in the overlap budget
+            tokens = [token for part in reversed(tail) for token in part]
+            return '\n\n'.join(piece for piece, _ in pieces), tokens
+
+        tokens = [token for part in reversed(tail) for token in part][-overlap_tokens:]
+        return self.encoding.decode(tokens), tokens
 
 
 class AzureRAGService:
@@ -274,6 +359,17 @@ class AzureRAGService:
         # Initialize local chunker
         self.chunker = LocalChunker(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
 
+        # SearchClient is synchronous (blocking HTTP + paged iteration), so run
+        # queries on a dedicated pool to keep the event loop responsive
+        self._search_pool = ThreadPoolExecutor(
+            max_workers=SEARCH_POOL_WORKERS,
+            thread_name_prefix="search"
+        )
+
+        # Recent query embeddings (LRU); regenerating or comparing a prompt
+        # searches with the same query text again
+        self._query_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+
         self._ensure_index()
 
     def _ensure_index(self):
@@ -312,8 +408,9 @@ class AzureRAGService:
                     vector_search_dimensions=EMBEDDING_DIMENSIONS,
                     vector_search_profile_name="default-vector-profile",
                     searchable=True,
-                    retrievable=True,
-                    stored=True
+                    # Vectors are only ever searched, never read back; keep the
+                    # 1536 floats per hit out of search responses
+                    hidden=True
                 ),
             ]
 
@@ -421,6 +518,21 @@ class AzureRAGService:
         embeddings = await self._generate_embeddings_bulk([text])
         return embeddings[0]
 
+    async def _get_query_embedding(self, query: str) -> List[float]:
+        """Return the query's embedding, reusing it if the query was seen recently."""
+        cache = self._query_embeddings
+        embedding = cache.get(query)
+        if embedding is not None:
+            cache.move_to_end(query)
+            return embedding
+
+        embedding = await self._generate_embedding(query)
+        if QUERY_EMBEDDING_CACHE_SIZE > 0:
+            cache[query] = embedding
+            if len(cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                cache.popitem(last=False)
+        return embedding
+
     async def upload_document(
         self,
         file_id: str,
@@ -507,7 +619,7 @@ class AzureRAGService:
             log.info(f"[RAG] Starting search for query (length: {len(query)})")
             log.info(f"[RAG] Generating embedding...")
             embed_start = time.time()
-            query_embedding = await self._generate_embedding(query)
+            query_embedding = await self._get_query_embedding(query)
             embed_time = time.time() - embed_start
             log.info(f"[RAG] Embedding generated in {embed_time:.2f}s")
 
@@ -531,27 +643,14 @@ class AzureRAGService:
                 fields="content_vector"
             )
 
-            results = self.search_client.search(
-                search_text=None,
-                vector_queries=[vector_query],
-                filter=filter_str,
-                top=top_k,
-                select=["file_id", "filename", "content", "chunk_index", "token_count", "page_number", "section_header"]
+            chunks = await asyncio.get_running_loop().run_in_executor(
+                self._search_pool,
+                self._vector_search,
+                vector_query,
+                filter_str,
+                top_k
             )
 
-            chunks = []
-            for result in results:
-                chunks.append({
-                    "file_id": result["file_id"],
-                    "filename": result["filename"],
-                    "content": result["content"],
-                    "chunk_index": result["chunk_index"],
-                    "token_count": result["token_count"],
-                    "page_number": result.get("page_number"),
-                    "section_header": result.get("section_header"),
-                    "score": result.get("@search.score", 0)
-                })
-
             search_time = time.time() - search_start
             total_time = time.time() - start_time
             log.info(f"[RAG] Search completed in {search_time:.2f}s (total: {total_time:.2f}s)")
@@ -563,6 +662,35 @@ class AzureRAGService:
             log.error(f"[RAG] Search failed after {total_time:.2f}s: {e}", exc_info=True)
             raise
 
+    def _vector_search(
+        self,
+        vector_query: VectorizedQuery,
+        filter_str: str,
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """Run a blocking vector search and materialize the results (worker thread)"""
+        results = self.search_client.search(
+            search_text=None,
+            vector_queries=[vector_query],
+            filter=filter_str,
+            top=top_k,
+            select=["file_id", "filename", "content", "chunk_index", "token_count", "page_number", "section_header"]
+        )
+
+        chunks = []
+        for result in results:
+            chunks.append({
+                "file_id": result["file_id"],
+                "filename": result["filename"],
+                "content": result["content"],
+                "chunk_index": result["chunk_index"],
+                "token_count": result["token_count"],
+                "page_number": result.get("page_number"),
+                "section_header": result.get("section_header"),
+                "score": result.get("@search.score", 0)
+            })
+        return chunks
+
     async def get_document_status(
         self,
         file_id: str,
@@ -7,6 +7,7 @@ Enhanced with OCR support for scanned PDFs using Azure Document Intelligence
 """
 
 import io
+import asyncio
 import logging
 from typing import Optional
 from dataclasses import dataclass
@@ -32,6 +33,19 @@ class FileProcessingResult:
 class FileProcessor:
     """Simplified file processor - only extracts text"""
     
+    @staticmethod
+    def _read_pdf_text(content: bytes) -> tuple[str, int]:
+        """Extract the embedded text of every page with PyPDF2; returns (text, page count)."""
+        reader = PyPDF2.PdfReader(io.BytesIO(content))
+
+        text_parts = []
+        for page in reader.pages:
+            text = page.extract_text()
+            if text:
+                text_parts.append(text)
+
+        return '\n\n'.join(text_parts), len(reader.pages)
+
     @staticmethod
     async def extract_text_from_pdf(content: bytes) -> str:
         """
@@ -49,18 +63,10 @@ class FileProcessor:
             Extracted text from the PDF
         """
         try:
-            # Step 1: Try PyPDF2 extraction first
-            pdf_file = io.BytesIO(content)
-            reader = PyPDF2.PdfReader(pdf_file)
-
-            text_parts = []
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-
-            extracted_text = '\n\n'.join(text_parts)
-            num_pages = len(reader.pages)
+            # Step 1: Try PyPDF2 extraction first (CPU-bound, so off the event loop)
+            extracted_text, num_pages = await asyncio.to_thread(
+                FileProcessor._read_pdf_text, content
+            )
 
             # Step 2: Check if OCR is needed
             # Heuristic: If less than 50 chars per page on average, likely scanned
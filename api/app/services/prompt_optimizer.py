@@ -6,7 +6,9 @@ for legal document generation. It implements a Self-Refine pattern where
 Claude acts as a meta-optimizer for prompt quality.
 """
 
+import os
 import json
+import asyncio
 import logging
 from typing import Optional
 from datetime import datetime
@@ -18,6 +20,12 @@ from ..llm.clients import anthropic_client, ANTHROPIC_MODEL
 
 logger = logging.getLogger(__name__)
 
+# Cap concurrent optimizer calls per process so a burst of requests can't
+# open unbounded connections to Anthropic and trip the rate limit
+ANTHROPIC_MAX_CONCURRENCY = int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "8"))
+OPTIMIZER_TIMEOUT_SECONDS = float(os.getenv("PROMPT_OPTIMIZER_TIMEOUT", "10"))
+_ANTHROPIC_SEM = asyncio.Semaphore(ANTHROPIC_MAX_CONCURRENCY)
+
 # Legal-specific meta-prompt template for optimization
 LEGAL_PROMPT_OPTIMIZER_TEMPLATE = """You are an expert legal AI assistant. Your task is to enhance this user's prompt for legal document generation by making it more specific and actionable, while keeping it concise.
 
@@ -208,21 +216,24 @@ class PromptOptimizerService:
             Parsed JSON response from Claude containing optimization results
 
         Raises:
-            Exception: If API call fails or response is invalid JSON
+            Exception: If API call fails, times out, or response is invalid JSON
         """
         try:
-            # Call Claude with the meta-prompt
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,  # Reduced - we want concise responses (2-4 sentences)
-                temperature=0.5,  # Slightly higher for more natural improvements
-                messages=[
-                    {
-                        "role": "user",
-                        "content": meta_prompt
-                    }
-                ]
-            )
+            # Call Claude with the meta-prompt (bounded fan-out, fail fast on slow calls)
+            async with _ANTHROPIC_SEM, asyncio.timeout(OPTIMIZER_TIMEOUT_SECONDS):
+                response = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=1024,  # Reduced - we want concise responses (2-4 sentences)
+                    temperature=0.5,  # Slightly higher for more natural improvements
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": meta_prompt
+                        }
+                    ]
+                )
+
+            self._log_usage(response)
 
             # Extract text from response
             if not response.content or len(response.content) == 0:
@@ -250,6 +261,9 @@ class PromptOptimizerService:
 
             return result
 
+        except TimeoutError:
+            logger.error(f"Claude API call timed out after {OPTIMIZER_TIMEOUT_SECONDS}s")
+            raise Exception("Prompt optimization timed out")
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from Claude: {str(e)}")
             logger.debug(f"Raw response: {response_text if 'response_text' in locals() else 'N/A'}")
@@ -258,6 +272,34 @@ class PromptOptimizerService:
             logger.error(f"Claude API call failed: {str(e)}")
             raise
 
+    def _log_usage(self, response) -> None:
+        """
+        Log token usage, including prompt-cache reads/writes, for a Claude response.
+
+        Cache fields are only present once prompt caching is enabled (and on SDK
+        versions that report them), so they default to 0.
+        """
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        logger.info(
+            "anthropic_usage model=%s input=%d output=%d cache_read=%d cache_write=%d",
+            self.model,
+            usage.input_tokens or 0,
+            usage.output_tokens or 0,
+            cache_read,
+            cache_write,
+            extra={
+                "cache_read": cache_read,
+                "cache_write": cache_write,
+                "input": usage.input_tokens,
+                "output": usage.output_tokens,
+            }
+        )
+
 
 # Singleton instance
 _optimizer_service = None
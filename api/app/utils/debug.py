@@ -10,22 +10,27 @@ from typing import List, Dict, Any
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 log = logging.getLogger("lumen.debug")
 
+# Read once at import; the flag is a deployment setting, not a runtime toggle
+_TRUE_VALUES = frozenset(("1", "true", "yes", "on"))
+DEBUG_LOG_PROMPTS = os.getenv("DEBUG_LOG_PROMPTS", "false").lower() in _TRUE_VALUES
+
 def debug_enabled() -> bool:
-    return os.getenv("DEBUG_LOG_PROMPTS", "false").lower() in ("1", "true", "yes", "on")
+    return DEBUG_LOG_PROMPTS
+
+_MESSAGE_SEP = "\n" + "-"*80 + "\n"
 
 def format_messages(messages: List[Dict[str, Any]]) -> str:
     """
     Pretty string with roles and content as the model receives them.
     """
-    parts = []
-    for i, m in enumerate(messages, start=1):
-        role = m.get("role", "?")
-        content = m.get("content", "")
-        parts.append(f"[{i:02d}] role={role}\n{content}")
-    return "\n" + ("\n" + "-"*80 + "\n").join(parts) + "\n"
+    parts = [
+        f"[{i:02d}] role={m.get('role', '?')}\n{m.get('content', '')}"
+        for i, m in enumerate(messages, start=1)
+    ]
+    return "\n" + _MESSAGE_SEP.join(parts) + "\n"
 
 def dump_messages(label: str, provider: str | None, model: str | None, messages: List[Dict[str, Any]]):
-    if not debug_enabled():
+    if not DEBUG_LOG_PROMPTS:
         return
     header = f"=== LLM REQUEST :: {label} :: provider={provider or '-'} model={model or '-'} ==="
     log.info("%s%s", header, format_messages(messages))
@@ -1,45 +1,66 @@
 # lumen/api/app/utils/diff.py
 from __future__ import annotations
+import bisect
 import difflib
+import itertools
 import re
-from typing import List
+from typing import List, Tuple
 
-_HEADING = re.compile(r'^\s{0,3}(#{1,6}|[0-9]+\.)\s+(.*)$')  # markdown or numbered headings
+# markdown or numbered headings, matched line-by-line over the whole text
+_HEADING_LINE = re.compile(r'^[ \t]*(?:#{1,6}|[0-9]+\.)[ \t]+\S.*$', re.MULTILINE)
 
-def _section_for_index(text: str, idx: int) -> str:
+def _heading_index(text: str) -> Tuple[List[int], List[str]]:
+    """
+    Collect (offsets, labels) for every heading in one pass, in document order.
+    Labels are short strings like '2. Obligations' or '## Term'.
+    """
+    offsets: List[int] = []
+    labels: List[str] = []
+    for m in _HEADING_LINE.finditer(text):
+        offsets.append(m.start())
+        labels.append(m.group(0).strip()[:80])
+    return offsets, labels
+
+def _section_for_index(index: Tuple[List[int], List[str]], idx: int) -> str:
     """
     Find the nearest preceding heading for a character index.
-    Returns a short label like '2. Obligations' or '## Term'.
     """
-    start = max(0, idx - 2000)  # search back a bit
-    snippet = text[start:idx]
-    lines = snippet.splitlines()[::-1]
-    for ln in lines:
-        m = _HEADING.match(ln.strip())
-        if m:
-            return m.group(0)[:80]
-    return "(no heading)"
+    offsets, labels = index
+    i = bisect.bisect_left(offsets, idx) - 1
+    return labels[i] if i >= 0 else "(no heading)"
 
 def summarize_diff(old: str, new: str, max_bullets: int = 5, max_chars: int = 600) -> List[str]:
     """
     Produce a few human-readable bullets of what changed between old and new.
     Section-aware (best-effort). Trimmed to keep small.
     """
-    s = difflib.SequenceMatcher(None, old, new, autojunk=True)
+    # Diff at line granularity: the matcher's cost scales with line count, not chars
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    s = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=True)
+
+    # line index -> char offset, for heading lookups
+    old_offsets = list(itertools.accumulate((len(ln) for ln in old_lines), initial=0))
+    new_offsets = list(itertools.accumulate((len(ln) for ln in new_lines), initial=0))
+    old_index = _heading_index(old)
+    new_index = _heading_index(new)
     bullets: List[str] = []
     for tag, i1, i2, j1, j2 in s.get_opcodes():
         if tag == "equal": 
             continue
-        section = _section_for_index(old, i1) if tag in ("delete", "replace") else _section_for_index(new, j1)
+        if tag in ("delete", "replace"):
+            section = _section_for_index(old_index, old_offsets[i1])
+        else:
+            section = _section_for_index(new_index, new_offsets[j1])
         if tag == "insert":
-            excerpt = new[j1:j2].strip()
+            excerpt = "".join(new_lines[j1:j2]).strip()
             kind = "added"
         elif tag == "delete":
-            excerpt = old[i1:i2].strip()
+            excerpt = "".join(old_lines[i1:i2]).strip()
             kind = "removed"
         else:
             # replace
-            excerpt = new[j1:j2].strip()
+            excerpt = "".join(new_lines[j1:j2]).strip()
             kind = "updated"
         # compact excerpt
         excerpt = ' '.join(excerpt.split())
@@ -1,5 +1,59 @@
 # lumen/api/app/utils/document_processor.py
 import re
+from bisect import bisect_left
+from functools import lru_cache
+
+# Compiled once at import; these run on every provider response
+_DOCUMENT_TAG_RE = re.compile(r'<document>(.*?)</document>', re.DOTALL | re.IGNORECASE)
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+# Conversational preambles that LLMs often add before the actual content
+_PREAMBLE_RES = [
+    # "Sure, here's the document:", "Below is the revised content:", etc.
+    re.compile(
+        r'^(Sure,?\s+)?(here\'?s?|below is|here is)\s+(the\s+)?(updated|revised|complete|full|requested)?\s*(document|content|text|draft|version)?[:\.]?\s*',
+        re.IGNORECASE | re.MULTILINE
+    ),
+    # "I've updated the document:", "I have revised the content:", etc.
+    re.compile(
+        r'^(I\'ve|I have)\s+(updated|revised|created|prepared|made|completed)\s+.*?[:\.]?\s*',
+        re.IGNORECASE | re.MULTILINE
+    ),
+    # "Let me provide...", "I'll create...", etc.
+    re.compile(r'^(Let me|I\'ll|I will)\s+.*?[:\.]?\s*', re.IGNORECASE | re.MULTILINE),
+    # "Here you go:", "There you go:", etc.
+    re.compile(r'^(Here|There)\s+you\s+go[:\.]?\s*', re.IGNORECASE | re.MULTILINE),
+]
+
+# "Unchanged" placeholder formats as one alternation, so a draft is scanned once:
+#   [Sections 1-4 remain unchanged], [Previous sections unchanged],
+#   [All previous sections unchanged], and a catch-all for any other bracketed
+#   "...unchanged..." note on a single line
+_UNCHANGED_PLACEHOLDER_RE = re.compile(
+    r'\[(?:'
+    r'(?P<numbered>Sections? [\d\-,\s]+(?:and [\d]+)?\s+(?:remain|remains|stay)s?\s+(?:unchanged|the same))'
+    r'|(?P<previous>Previous sections?\s+(?:remain\s+)?unchanged)'
+    r'|(?P<all_previous>All previous sections?\s+(?:remain\s+)?unchanged)'
+    r'|(?P<other>[^\]\n]*?unchanged[^\]\n]*)'
+    r')\]',
+    re.IGNORECASE
+)
+
+# Expansion order of the formats above: a placeholder is expanded after every
+# earlier-ranked one, so only those expansions shift the draft position used to
+# pick the sections before an unparseable placeholder
+_PLACEHOLDER_RANK = {"numbered": 0, "previous": 1, "all_previous": 2, "other": 3}
+
+# Section references inside a placeholder: a range ("1-4") or bare numbers
+_SECTION_RANGE_RE = re.compile(r'(\d+)\s*-\s*(\d+)')
+_SECTION_NUMBER_RE = re.compile(r'\d+')
+
+# Markdown header lines with optional numbering: ## 1. DEFINITIONS, ### 5.1 Governing Law, etc.
+# ([^\S\n] is whitespace that can't run onto the next line)
+_SECTION_HEADER_RE = re.compile(
+    r'^(#{1,6})[^\S\n]+(\d+(?:\.\d+)*\.?)?[^\S\n]*(.+?)$',
+    re.MULTILINE
+)
 
 
 def extract_clean_response(response_text: str) -> str:
@@ -26,31 +80,19 @@ def extract_clean_response(response_text: str) -> str:
         return ""
 
     # Strategy 1: Try to extract content between <document>...</document> tags
-    doc_match = re.search(r'<document>(.*?)</document>', response_text, re.DOTALL | re.IGNORECASE)
+    doc_match = _DOCUMENT_TAG_RE.search(response_text)
     if doc_match:
         return doc_match.group(1).strip()
 
     # Strategy 2: Try to extract JSON from code blocks for structured edits
-    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
+    json_match = _JSON_BLOCK_RE.search(response_text)
     if json_match:
         return json_match.group(1).strip()
 
     # Strategy 3: Remove common preamble patterns
-    # These patterns match conversational preambles that LLMs often add
-    patterns_to_remove = [
-        # "Sure, here's the document:", "Below is the revised content:", etc.
-        r'^(Sure,?\s+)?(here\'?s?|below is|here is)\s+(the\s+)?(updated|revised|complete|full|requested)?\s*(document|content|text|draft|version)?[:\.]?\s*',
-        # "I've updated the document:", "I have revised the content:", etc.
-        r'^(I\'ve|I have)\s+(updated|revised|created|prepared|made|completed)\s+.*?[:\.]?\s*',
-        # "Let me provide...", "I'll create...", etc.
-        r'^(Let me|I\'ll|I will)\s+.*?[:\.]?\s*',
-        # "Here you go:", "There you go:", etc.
-        r'^(Here|There)\s+you\s+go[:\.]?\s*',
-    ]
-
     cleaned = response_text
-    for pattern in patterns_to_remove:
-        cleaned = re.sub(pattern, '', cleaned, count=1, flags=re.IGNORECASE | re.MULTILINE)
+    for pattern in _PREAMBLE_RES:
+        cleaned = pattern.sub('', cleaned, count=1)
 
     return cleaned.strip()
 
@@ -69,119 +111,102 @@ def expand_unchanged_sections(draft: str, current_doc: str) -> str:
     if not current_doc or not draft:
         return draft
     
-    # Pattern matches various "unchanged" placeholder formats
-    patterns = [
-        r'\[Sections? [\d\-,\s]+(?:and [\d]+)?\s+(?:remain|remains|stay)s?\s+(?:unchanged|the same)\]',
-        r'\[Previous sections?\s+(?:remain\s+)?unchanged\]',
-        r'\[All previous sections?\s+(?:remain\s+)?unchanged\]',
-        r'\[.*?unchanged.*?\]',  # Catch-all for other variations
-    ]
-    
-    # Check if draft contains any "unchanged" placeholder
-    has_placeholder = False
-    for pattern in patterns:
-        if re.search(pattern, draft, re.IGNORECASE):
-            has_placeholder = True
-            break
-    
-    if not has_placeholder:
+    matches = list(_UNCHANGED_PLACEHOLDER_RE.finditer(draft))
+    if not matches:
         return draft
     
     # Extract sections from current document
     # Match markdown headers (## Section or # Section)
     sections = _extract_sections(current_doc)
     
-    # Try to intelligently replace placeholders
-    result = draft
+    # Try to intelligently replace placeholders, rebuilding the draft in one join
+    parts = []
+    cursor = 0
+    # Length change from the replacements made so far, per placeholder rank
+    shifts = [0] * len(_PLACEHOLDER_RANK)
     
-    for pattern in patterns:
-        matches = list(re.finditer(pattern, result, re.IGNORECASE))
+    for match in matches:
+        rank = _PLACEHOLDER_RANK[match.lastgroup]
+        placeholder = match.group(0)
+        
+        # Try to extract which sections are "unchanged"
+        section_refs = _parse_section_refs(placeholder)
+        
+        if section_refs:
+            # Replace with actual sections
+            replacement = _build_section_text(current_doc, sections, section_refs)
+        else:
+            # Can't parse specific sections, use all sections before this point
+            # (the draft offset, moved only by earlier-ranked expansions)
+            position = match.start() + sum(shifts[:rank])
+            replacement = _get_sections_before_placeholder(current_doc, sections, position)
         
-        for match in reversed(matches):  # Process from end to avoid offset issues
-            placeholder = match.group(0)
-            
-            # Try to extract which sections are "unchanged"
-            section_refs = _parse_section_refs(placeholder)
-            
-            if section_refs:
-                # Replace with actual sections
-                replacement = _build_section_text(sections, section_refs)
-            else:
-                # Can't parse specific sections, use all sections before this point
-                replacement = _get_sections_before_placeholder(current_doc, sections, match.start())
-            
-            if replacement:
-                result = result[:match.start()] + replacement + result[match.end():]
+        if replacement:
+            parts.append(draft[cursor:match.start()])
+            parts.append(replacement)
+            cursor = match.end()
+            shifts[rank] += len(replacement) - len(placeholder)
+    
+    parts.append(draft[cursor:])
+    result = "".join(parts)
     
     return result
 
 
 def _extract_sections(doc: str) -> list[dict]:
     """
-    Extract all markdown sections with their headers and content.
-    Returns list of {'level': int, 'title': str, 'number': str, 'content': str, 'start': int}
+    Extract all markdown sections with their headers and character spans.
+    Returns list of {'level': int, 'title': str, 'number': str, 'header': str,
+    'start': int, 'end': int}; a section's text is doc[start:end] (see _section_text).
     """
     sections = []
-    
-    # Match markdown headers with optional numbering
-    # Supports: ## 1. DEFINITIONS, ### 5.1 Governing Law, etc.
-    pattern = r'^(#{1,6})\s+(\d+(?:\.\d+)*\.?)?\s*(.+?)$'
-    
-    lines = doc.split('\n')
-    current_section = None
-    
-    for i, line in enumerate(lines):
-        match = re.match(pattern, line)
-        if match:
-            # Save previous section
-            if current_section:
-                sections.append(current_section)
-            
-            level = len(match.group(1))
-            number = match.group(2) or ''
-            title = match.group(3).strip()
-            
-            current_section = {
-                'level': level,
-                'number': number.rstrip('.'),
-                'title': title,
-                'content': line + '\n',
-                'start': i,
-                'header': line,
-            }
-        elif current_section:
-            current_section['content'] += line + '\n'
-    
-    # Add last section
-    if current_section:
-        sections.append(current_section)
-    
+
+    for match in _SECTION_HEADER_RE.finditer(doc):
+        # Previous section ends where this header starts
+        if sections:
+            sections[-1]['end'] = match.start()
+
+        level = len(match.group(1))
+        number = match.group(2) or ''
+        title = match.group(3).strip()
+
+        sections.append({
+            'level': level,
+            'number': number.rstrip('.'),
+            'title': title,
+            'header': match.group(0),
+            'start': match.start(),
+            'end': len(doc),
+        })
+
     return sections
 
 
-def _parse_section_refs(placeholder: str) -> list[str]:
+def _section_text(doc: str, section: dict) -> str:
+    """Materialize a section's text from its span."""
+    return doc[section['start']:section['end']].rstrip()
+
+
+@lru_cache(maxsize=256)
+def _parse_section_refs(placeholder: str) -> tuple[str, ...]:
     """
     Parse section references from placeholder text.
-    '[Sections 1-4 remain unchanged]' -> ['1', '2', '3', '4']
-    '[Section 3 remains unchanged]' -> ['3']
+    '[Sections 1-4 remain unchanged]' -> ('1', '2', '3', '4')
+    '[Section 3 remains unchanged]' -> ('3',)
+    Cached, since models repeat the same placeholder wording across drafts.
     """
-    # Look for patterns like "1-4", "1, 2, and 5", "3"
-    numbers = re.findall(r'\d+', placeholder)
-    if not numbers:
-        return []
-    
     # Check for range (1-4)
-    range_match = re.search(r'(\d+)\s*-\s*(\d+)', placeholder)
+    range_match = _SECTION_RANGE_RE.search(placeholder)
     if range_match:
         start = int(range_match.group(1))
         end = int(range_match.group(2))
-        return [str(i) for i in range(start, end + 1)]
+        return tuple(str(i) for i in range(start, end + 1))
     
-    # Individual numbers
-    return numbers
+    # Individual numbers, e.g. "1, 2, and 5" or "3"
+    return tuple(_SECTION_NUMBER_RE.findall(placeholder))
 
 
-def _build_section_text(sections: list[dict], section_refs: list[str]) -> str:
+def _build_section_text(doc: str, sections: list[dict], section_refs: tuple[str, ...]) -> str:
     """Build text for specified sections."""
     result = []
     for section in sections:
@@ -189,7 +214,7 @@ def _build_section_text(sections: list[dict], section_refs: list[str]) -> str:
         section_num = section['number'].split('.')[0] if section['number'] else ''
         
         if section_num in section_refs:
-            result.append(section['content'].rstrip())
+            result.append(_section_text(doc, section))
     
     return '\n\n'.join(result) if result else ''
 
@@ -199,15 +224,13 @@ def _get_sections_before_placeholder(doc: str, sections: list[dict], placeholder
     Get all sections that appear before the placeholder position.
     This is the fallback when we can't parse specific section numbers.
     """
-    # Count characters in doc to find which sections are before placeholder
-    char_count = 0
-    previous_sections = []
-    
-    for section in sections:
-        if char_count < placeholder_pos:
-            previous_sections.append(section['content'].rstrip())
-            char_count += len(section['content'])
-        else:
-            break
-    
-    return '\n\n'.join(previous_sections) if previous_sections else ''
\ No newline at end of file
+    if not sections:
+        return ''
+
+    # Section spans are contiguous, so the characters covered by the sections
+    # before section i are its start minus the first section's start; bisect on
+    # that running total instead of summing span lengths one by one
+    base = sections[0]['start']
+    count = bisect_left(sections, placeholder_pos, key=lambda section: section['start'] - base)
+
+    return '\n\n'.join(_section_text(doc, section) for section in sections[:count])
\ No newline at end of file
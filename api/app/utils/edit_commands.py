@@ -1,8 +1,11 @@
 # lumen/api/app/utils/edit_commands.py
 from pydantic import BaseModel, Field
 from typing import Literal, List
+import bisect
 import re
 
+_WORD_RE = re.compile(r'\S+')
+
 
 class EditCommand(BaseModel):
     """A single edit operation to apply to the document."""
@@ -22,67 +25,131 @@ def apply_edits(original_doc: str, edit_plan: EditPlan) -> str:
     """
     Apply a series of edit commands to a document.
     Returns the fully edited document.
+
+    Anchors are resolved against the original document, then all edits are
+    applied in a single pass (one join instead of a rebuild per edit). Edits
+    that overlap a region already consumed by an earlier edit are skipped.
     """
-    result = original_doc
-    
-    for edit in edit_plan.edits:
+    positions = _locate_anchors(
+        original_doc,
+        [e.anchor for e in edit_plan.edits if e.anchor and e.type not in ("append", "delete")]
+    )
+
+    # (start, end, replacement, plan_order) spans against original_doc
+    ops: list[tuple[int, int, str, int]] = []
+    appends: list[str] = []
+
+    for order, edit in enumerate(edit_plan.edits):
         if edit.type == "append":
             # Add to end of document
-            result = result.rstrip() + "\n\n" + (edit.content or "")
-            
-        elif edit.type == "insert_after":
-            # Find anchor text and insert after it
-            if not edit.anchor:
-                continue
-            pos = result.find(edit.anchor)
-            if pos == -1:
-                # Try fuzzy match if exact match fails
-                pos = _fuzzy_find(result, edit.anchor)
-            if pos != -1:
-                insert_pos = pos + len(edit.anchor)
-                result = result[:insert_pos] + "\n\n" + (edit.content or "") + result[insert_pos:]
-                
+            appends.append(edit.content or "")
+            continue
+
+        if not edit.anchor:
+            continue
+
+        if edit.type == "delete":
+            # Remove every occurrence of the anchor text
+            pos = original_doc.find(edit.anchor)
+            while pos != -1:
+                end_pos = pos + len(edit.anchor)
+                ops.append((pos, end_pos, "", order))
+                pos = original_doc.find(edit.anchor, end_pos)
+            continue
+
+        pos = positions.get(edit.anchor, -1)
+        if pos == -1:
+            continue
+
+        if edit.type == "insert_after":
+            insert_pos = pos + len(edit.anchor)
+            ops.append((insert_pos, insert_pos, "\n\n" + (edit.content or ""), order))
         elif edit.type == "insert_before":
-            # Find anchor text and insert before it
-            if not edit.anchor:
-                continue
-            pos = result.find(edit.anchor)
-            if pos == -1:
-                pos = _fuzzy_find(result, edit.anchor)
-            if pos != -1:
-                result = result[:pos] + (edit.content or "") + "\n\n" + result[pos:]
-                
+            ops.append((pos, pos, (edit.content or "") + "\n\n", order))
         elif edit.type == "replace":
-            # Replace anchor text with new content
-            if not edit.anchor:
-                continue
-            pos = result.find(edit.anchor)
-            if pos == -1:
-                pos = _fuzzy_find(result, edit.anchor)
-            if pos != -1:
-                end_pos = pos + len(edit.anchor)
-                result = result[:pos] + (edit.content or "") + result[end_pos:]
-                
-        elif edit.type == "delete":
-            # Remove anchor text
-            if not edit.anchor:
-                continue
-            result = result.replace(edit.anchor, "")
-    
+            ops.append((pos, pos + len(edit.anchor), edit.content or "", order))
+
+    ops.sort(key=lambda op: (op[0], op[3]))
+
+    out: list[str] = []
+    cursor = 0
+    for start, end, replacement, _ in ops:
+        if start < cursor:
+            # Overlaps text already replaced/deleted by an earlier edit
+            continue
+        out.append(original_doc[cursor:start])
+        out.append(replacement)
+        cursor = max(cursor, end)
+    out.append(original_doc[cursor:])
+    result = "".join(out)
+
+    for content in appends:
+        result = result.rstrip() + "\n\n" + content
+
     return result
 
 
-def _fuzzy_find(text: str, anchor: str, threshold: int = 20) -> int:
+def _locate_anchors(doc: str, anchors: list[str]) -> dict[str, int]:
+    """
+    Resolve every distinct anchor to its first position in the document up front.
+    Exact matches are tried first; only misses fall back to fuzzy search.
+    Returns {anchor: position}, with -1 for anchors that could not be found.
+    """
+    positions: dict[str, int] = {}
+    fuzzy_index = None
+    for anchor in anchors:
+        if anchor in positions:
+            continue
+        pos = doc.find(anchor)
+        if pos == -1:
+            # Try fuzzy match if exact match fails (index built once, on first miss)
+            if fuzzy_index is None:
+                fuzzy_index = _build_fuzzy_index(doc)
+            pos = _fuzzy_find(fuzzy_index, anchor)
+        positions[anchor] = pos
+    return positions
+
+
+def _build_fuzzy_index(doc: str) -> tuple[str, list[int], list[int]]:
+    """
+    Build a whitespace-collapsed, lowercased copy of the document for fuzzy search.
+    Returns (normalized_text, normalized_word_starts, original_word_starts).
+    """
+    words: list[str] = []
+    norm_starts: list[int] = []
+    orig_starts: list[int] = []
+    npos = 0
+    for m in _WORD_RE.finditer(doc):
+        # Lowercase per word and advance by the lowered length, so a case
+        # mapping that changes length (e.g. 'İ') only shifts its own word
+        word = m.group().lower()
+        words.append(word)
+        norm_starts.append(npos)
+        orig_starts.append(m.start())
+        npos += len(word) + 1
+
+    return ' '.join(words), norm_starts, orig_starts
+
+
+def _fuzzy_find(index: tuple[str, list[int], list[int]], anchor: str) -> int:
     """
-    Fuzzy search for anchor text in document.
-    Returns position if found within threshold, -1 otherwise.
+    Fuzzy search for anchor text in document (see _build_fuzzy_index).
+    Matches the first few words of the anchor, ignoring case and whitespace differences.
+    Returns position in the original document if found, -1 otherwise.
     """
-    # Simple implementation: try to find first few words
+    normalized, norm_starts, orig_starts = index
     anchor_words = anchor.split()[:5]
-    search_pattern = r'\s+'.join(re.escape(w) for w in anchor_words)
-    
-    match = re.search(search_pattern, text, re.IGNORECASE)
-    return match.start() if match else -1
+    if not anchor_words:
+        return -1
+
+    pos = normalized.find(' '.join(anchor_words).lower())
+    if pos == -1:
+        return -1
+
+    # Map back to the original document via the containing word (the offset
+    # inside it is exact unless lowercasing changed that word's length)
+    k = bisect.bisect_right(norm_starts, pos) - 1
+    return orig_starts[k] + (pos - norm_starts[k])
 
 
 def generate_edit_system_prompt() -> str:
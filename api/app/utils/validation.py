@@ -2,13 +2,83 @@
 import re
 from typing import List
 
+# Preamble indicators fused into one alternation so the response prefix is
+# scanned once, case-insensitively, without a lowercased copy
+_PREAMBLE_INDICATOR_RE = re.compile(
+    r"\b(?:"
+    r"(?:sure,?\s+)?(?:here'?s?|below is|here is)"
+    r"|i've|i have|let me"
+    r"|(?:updated|revised|created|prepared)\s+(?:the\s+)?(?:document|draft|content)"
+    r")\b",
+    re.IGNORECASE
+)
+
+# Placeholder patterns for validate_completeness, compiled once at import.
+# Each kind gets its own pass: a fused alternation is leftmost-first, so a
+# lazy "[... remain ...]" match could run past a "]" and swallow a later
+# [INSERT ...] or [TODO ...] placeholder
+_PLACEHOLDER_PATTERNS = (
+    (re.compile(r'\[.*?(?:remain|unchanged|same|previous).*?\]', re.IGNORECASE), "Placeholder found"),
+    (re.compile(r'\.\.\.\s*\(.*?(?:remain|unchanged|same).*?\)', re.IGNORECASE), "Ellipsis placeholder found"),
+    (re.compile(r'(?:content|section|text)\s+(?:remains?|unchanged)', re.IGNORECASE), "Incomplete section reference"),
+    (re.compile(r'\[INSERT\s+.*?\]', re.IGNORECASE), "Template placeholder not filled"),
+    (re.compile(r'\[TODO.*?\]', re.IGNORECASE), "TODO placeholder found"),
+)
+
+# Long underscore lines often used as blanks, and the keywords that mark
+# one as a signature line when they appear within 100 chars of it
+_BLANK_LINE_RE = re.compile(r'_{3,}')
+_SIGNATURE_KEYWORDS = ('signature', 'by:', 'name:', 'title:', 'date:', 'witness', 'signed')
+_SIGNATURE_KEYWORD_RE = re.compile('|'.join(map(re.escape, _SIGNATURE_KEYWORDS)), re.IGNORECASE)
+_SIGNATURE_KEYWORD_MAX_LEN = max(map(len, _SIGNATURE_KEYWORDS))
+
+# Truncation markers: a line ending in an ellipsis (which covers standalone
+# "..." lines) is a plain substring test; only the case-insensitive
+# [continued] / [cont.] marker needs a pattern
+_CONTINUED_MARKER_RE = re.compile(r'\[cont(?:inued|\.)\]', re.IGNORECASE)
+
+# Starter text of a blank editor document, lowercased for matching
+_PLACEHOLDER_DOC_MARKERS = tuple(
+    marker.lower()
+    for marker in ("# New Document", "Type here", "Start typing", "Enter text", "Untitled")
+)
+_NON_SPACE_RE = re.compile(r'\S')
+
 
 class ValidationIssue:
-    """Represents a validation problem found in generated content."""
-    def __init__(self, severity: str, message: str, location: str = ""):
+    """
+    Represents a validation problem found in generated content.
+
+    Issues tied to a match can pass the matched span and the text instead of
+    a location; the context snippet is then only built if location is read.
+    """
+    __slots__ = ("severity", "message", "span", "_location", "_text")
+
+    def __init__(
+        self,
+        severity: str,
+        message: str,
+        location: str = "",
+        span: tuple[int, int] | None = None,
+        text: str | None = None,
+    ):
         self.severity = severity  # "error", "warning", "info"
         self.message = message
-        self.location = location
+        self.span = span  # (start, end) of the offending match, if any
+        self._location = location
+        self._text = text if span is not None else None
+
+    @property
+    def location(self) -> str:
+        if self._text is not None:
+            self._location = _extract_context(self._text, *self.span)
+            self._text = None
+        return self._location
+
+    @location.setter
+    def location(self, value: str) -> None:
+        self._location = value
+        self._text = None
 
 
 def validate_completeness(generated: str, original: str | None = None) -> List[ValidationIssue]:
@@ -20,7 +90,9 @@ def validate_completeness(generated: str, original: str | None = None) -> List[V
 
     # Check for preamble text that indicates the LLM didn't follow format instructions
     if has_preamble_text(generated):
-        first_line = generated.split('\n')[0][:100]
+        # First line, capped at 100 chars; bounded find instead of splitting the draft
+        line_end = generated.find('\n', 0, 100)
+        first_line = generated[:line_end if line_end >= 0 else 100]
         issues.append(ValidationIssue(
             severity="warning",
             message="Response contains preamble text (e.g., 'Sure, here is...', 'Below is...')",
@@ -28,60 +100,57 @@ def validate_completeness(generated: str, original: str | None = None) -> List[V
         ))
 
     # Check for placeholder patterns (skip typical signature blocks later)
-    placeholder_patterns = [
-        (r'\[.*?(?:remain|unchanged|same|previous).*?\]', "Placeholder found"),
-        (r'\.\.\.\s*\(.*?(?:remain|unchanged|same).*?\)', "Ellipsis placeholder found"),
-        (r'(?:content|section|text)\s+(?:remains?|unchanged)', "Incomplete section reference"),
-        (r'\[INSERT\s+.*?\]', "Template placeholder not filled"),
-        (r'\[TODO.*?\]', "TODO placeholder found"),
-    ]
-
-    for pattern, msg in placeholder_patterns:
-        for match in re.finditer(pattern, generated, re.IGNORECASE):
-            context = _extract_context(generated, match.start(), match.end())
+    for pattern, msg in _PLACEHOLDER_PATTERNS:
+        for match in pattern.finditer(generated):
             issues.append(ValidationIssue(
                 severity="error",
                 message=f"{msg}: '{match.group()}'",
-                location=context
+                span=match.span(),
+                text=generated
             ))
 
     # Detect long underscore lines often used as blanks; allow signature blocks.
-    blank_pattern = r'_{3,}'
-    for match in re.finditer(blank_pattern, generated):
-        context_before = generated[max(0, match.start() - 100):match.start()].lower()
-        context_after = generated[match.end():min(len(generated), match.end() + 100)].lower()
-
-        signature_keywords = ['signature', 'by:', 'name:', 'title:', 'date:', 'witness', 'signed']
-        is_signature = any(kw in context_before or kw in context_after for kw in signature_keywords)
+    # The match itself is all underscores, so searching the whole window is
+    # the same as searching the text before and after it separately.
+    # Blanks in a form or signature block have overlapping windows: reuse the
+    # last keyword hit while it is still inside the window, and after a miss
+    # only search the part of the window the previous search did not cover.
+    keyword = None
+    missed_until = 0
+    for match in _BLANK_LINE_RE.finditer(generated):
+        window_start = max(0, match.start() - 100)
+        window_end = match.end() + 100
+        if keyword is None or keyword.start() < window_start or keyword.end() > window_end:
+            search_from = max(window_start, missed_until - _SIGNATURE_KEYWORD_MAX_LEN + 1)
+            keyword = _SIGNATURE_KEYWORD_RE.search(generated, search_from, window_end)
+            missed_until = window_end if keyword is None else 0
+        is_signature = keyword is not None
 
         if not is_signature:
-            context = _extract_context(generated, match.start(), match.end())
             issues.append(ValidationIssue(
                 severity="error",
                 message=f"Blank placeholder line: '{match.group()}'",
-                location=context
+                span=match.span(),
+                text=generated
             ))
 
     # Truncation markers
-    truncation_patterns = [
-        r'\.\.\.$',                    # Ends with ellipsis
-        r'\[cont(?:inued|\.)\]',       # [continued] marker
-        r'(?:^|\n)\.\.\.(?:\n|$)',     # Standalone ellipsis line
-    ]
-    for pattern in truncation_patterns:
-        if re.search(pattern, generated, re.IGNORECASE | re.MULTILINE):
-            issues.append(ValidationIssue(
-                severity="error",
-                message="Document appears truncated or incomplete",
-                location="End of document"
-            ))
-            break
+    if (
+        '...\n' in generated
+        or generated.endswith('...')
+        or _CONTINUED_MARKER_RE.search(generated)
+    ):
+        issues.append(ValidationIssue(
+            severity="error",
+            message="Document appears truncated or incomplete",
+            location="End of document"
+        ))
 
     # Compare section structure against original when we have one
     if original and not _is_placeholder_document(original):
         orig_sections = _extract_section_headings(original)
         gen_sections = _extract_section_headings(generated)
-        missing = set(orig_sections) - set(gen_sections)
+        missing = set(orig_sections).difference(gen_sections)
         if missing:
             # Only list a few to avoid noisy reports
             preview = ', '.join(list(missing)[:3])
@@ -91,8 +160,8 @@ def validate_completeness(generated: str, original: str | None = None) -> List[V
                 location="Document structure"
             ))
 
-    # Formatting sanity checks
-    if re.search(r'#{7,}', generated):
+    # Formatting sanity checks (7+ '#' in a row)
+    if '#######' in generated:
         issues.append(ValidationIssue(
             severity="warning",
             message="Too many heading levels (> 6)",
@@ -132,46 +201,61 @@ def _extract_section_headings(text: str) -> List[str]:
       - Setext headings: "Title" underlined with "====" or "----"
 
     Only level 1–2 ATX are considered "major" to avoid noise.
-    """
-    headings: List[str] = []
-
-    # ATX-style (# .. ######) — capture up to trailing hashes; keep core title.
-    for match in re.finditer(r'^(#{1,6})\s+(.+?)\s*#*\s*$', text, re.MULTILINE):
-        level = len(match.group(1))
-        title = match.group(2).strip()
-        # Normalize: strip leading numbering like "1. ", "2) ", etc.
-        title = re.sub(r'^\d+[\.\)]\s*', '', title)
-        if level <= 2:
-            headings.append(title)
-
-    # Setext-style (underlines with === or ---)
-    for match in re.finditer(
-        r'^(?P<title>[^\n]+)\n(?P<underline>=+|-{2,})\s*$',
-        text,
-        re.MULTILINE
-    ):
-        title = match.group('title').strip()
-        title = re.sub(r'^\d+[\.\)]\s*', '', title)
-        headings.append(title)
 
-    return headings
+    A single pass over the lines with str builtins; most lines are body text
+    and are rejected on their first character or the next line's.
+    """
+    headings = []
+    lines = text.split('\n')
+    last = len(lines) - 1
+    i = 0
+    while i <= last:
+        line = lines[i]
+        if line[:1] == '#':
+            level = len(line) - len(line.lstrip('#'))
+            if level <= 2 and line[level:level + 1].isspace():
+                # Drop a closing "##" sequence along with surrounding spaces
+                title = line[level:].strip().rstrip('#').rstrip()
+                if title:
+                    headings.append(title)
+                    i += 1
+                    continue
+        if i < last:
+            underline = lines[i + 1].rstrip()
+            if underline and (
+                underline == '=' * len(underline)
+                or (len(underline) >= 2 and underline == '-' * len(underline))
+            ):
+                # A rule under a blank line is a thematic break, not a title
+                title = line.strip()
+                if title:
+                    headings.append(title)
+                i += 2
+                continue
+        i += 1
+
+    # Normalize: strip leading numbering like "1. ", "2) ", etc.
+    return [_strip_heading_number(title) for title in headings]
+
+
+def _strip_heading_number(title: str) -> str:
+    """Drop leading numbering like "1. " or "2) " from a heading title."""
+    rest = title.lstrip('0123456789')
+    if len(rest) < len(title) and rest[:1] in ('.', ')'):
+        return rest[1:].lstrip()
+    return title
 
 
 def _is_placeholder_document(text: str) -> bool:
     """Heuristic: is the original just a stub/placeholder?"""
-    stripped = text.strip()
-    placeholders = [
-        "# New Document",
-        "Type here",
-        "Start typing",
-        "Enter text",
-        "Untitled",
-    ]
-    if len(stripped) < 100:
-        for p in placeholders:
-            if p.lower() in stripped.lower():
-                return True
-    return False
+    # Only stubs under 100 chars once stripped qualify. A non-space character
+    # 99 past the first one means the stripped text is at least that long,
+    # which rules out real documents without copying them
+    first = _NON_SPACE_RE.search(text)
+    if first is None or _NON_SPACE_RE.search(text, first.start() + 99):
+        return False
+    lowered = text.strip().lower()
+    return any(marker in lowered for marker in _PLACEHOLDER_DOC_MARKERS)
 
 
 def has_preamble_text(text: str) -> bool:
@@ -189,19 +273,7 @@ def has_preamble_text(text: str) -> bool:
         return False
 
     # Check only the beginning of the response
-    first_150_chars = text[:150].lower()
-
-    preamble_indicators = [
-        r'\b(sure,?\s+)?(here\'?s?|below is|here is)\b',
-        r'\b(i\'ve|i have|let me)\b',
-        r'\b(updated|revised|created|prepared)\s+(the\s+)?(document|draft|content)\b',
-    ]
-
-    for pattern in preamble_indicators:
-        if re.search(pattern, first_150_chars, re.IGNORECASE):
-            return True
-
-    return False
+    return _PREAMBLE_INDICATOR_RE.search(text, 0, 150) is not None
 
 
 def format_validation_report(issues: List[ValidationIssue]) -> str:
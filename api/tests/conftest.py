@@ -9,15 +9,17 @@ This module provides core fixtures for:
 - RAG service mocking
 """
 
+import importlib
 import os
 import pytest
 import pytest_asyncio
-from typing import AsyncIterator
+from typing import AsyncIterator, Optional
 from unittest.mock import patch, AsyncMock, MagicMock
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection, AsyncSession, async_sessionmaker
 from sqlalchemy import text
-from contextlib import asynccontextmanager
+from sqlalchemy.exc import DBAPIError
+from contextlib import ExitStack, asynccontextmanager
 
 # Import app components
 from app.main import app
@@ -34,13 +36,188 @@ TEST_ORG_ID = "test_org_01"
 TEST_USER_ID = "test_user_01"
 TEST_VAULT_KEY = "test_key_01"
 
+# Modules that bind these names with "from ... import", so each one needs its
+# own patch. Resolved once here instead of on every patch start.
+_MEMBER_MAPPING_MODULES = tuple(importlib.import_module(name) for name in (
+    "app.db",
+    "app.routers.ai",
+    "app.routers.threads",
+    "app.routers.documents",
+    "app.routers.files",
+    "app.routers.selections",
+    "app.routers.me",
+))
+_MEMBER_SESSION_MODULES = tuple(importlib.import_module(name) for name in (
+    "app.db",
+    "app.routers.ai",
+    "app.routers.threads",
+    "app.routers.documents",
+    "app.routers.files",
+    "app.routers.selections",
+))
+_VAULT_MODULES = tuple(importlib.import_module(name) for name in (
+    "app.crypto.vault",
+    "app.routers.ai",
+    "app.routers.threads",
+    "app.routers.documents",
+    "app.routers.files",
+    "app.routers.selections",
+))
+
+# Session yielded by the patched member_session; db_session sets it per test
+_test_session: Optional[AsyncSession] = None
+
+
+# Control table plus the member schema, sent to Postgres as a single script
+_SCHEMA_DDL = f"""
+CREATE SCHEMA IF NOT EXISTS control;
+
+CREATE TABLE IF NOT EXISTS control.members (
+    org_id TEXT PRIMARY KEY,
+    schema_name TEXT NOT NULL UNIQUE,
+    vault_key_id TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Unqualified tables below land in the test schema via the engine's search_path
+CREATE SCHEMA IF NOT EXISTS {TEST_SCHEMA_NAME};
+
+-- Documents table
+CREATE TABLE IF NOT EXISTS documents (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    title TEXT NOT NULL,
+    content_enc BYTEA NOT NULL,
+    mime TEXT DEFAULT 'text/markdown',
+    created_by TEXT NOT NULL,
+    updated_by TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Document versions table
+CREATE TABLE IF NOT EXISTS doc_versions (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    version INT NOT NULL,
+    content_enc BYTEA NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE(document_id, version)
+);
+
+-- Chat threads table
+CREATE TABLE IF NOT EXISTS chat_threads (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    document_id UUID REFERENCES documents(id) ON DELETE SET NULL,
+    title TEXT,
+    created_by TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Chat messages table
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    thread_id UUID NOT NULL REFERENCES chat_threads(id) ON DELETE CASCADE,
+    role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
+    raw_hash TEXT,
+    text_enc BYTEA NOT NULL,
+    sanitized_enc BYTEA,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- AI requests table
+CREATE TABLE IF NOT EXISTS ai_requests (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    thread_id UUID NOT NULL REFERENCES chat_threads(id) ON DELETE CASCADE,
+    message_id UUID NOT NULL REFERENCES chat_messages(id) ON DELETE CASCADE,
+    scope TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- AI responses table
+CREATE TABLE IF NOT EXISTS ai_responses (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    request_id UUID NOT NULL REFERENCES ai_requests(id) ON DELETE CASCADE,
+    provider TEXT NOT NULL,
+    text_enc BYTEA NOT NULL,
+    input_tokens INT,
+    output_tokens INT,
+    latency_ms INT,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- AI selections table
+CREATE TABLE IF NOT EXISTS ai_selections (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    request_id UUID NOT NULL REFERENCES ai_requests(id) ON DELETE CASCADE,
+    provider TEXT NOT NULL,
+    selection_meta JSONB,
+    applied_to_document UUID REFERENCES documents(id) ON DELETE SET NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Uploaded files table
+CREATE TABLE IF NOT EXISTS uploaded_files (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    document_id UUID REFERENCES documents(id) ON DELETE SET NULL,
+    thread_id UUID REFERENCES chat_threads(id) ON DELETE CASCADE,
+    filename TEXT NOT NULL,
+    mime_type TEXT,
+    file_size_bytes BIGINT,
+    storage_path TEXT,
+    content_enc BYTEA NOT NULL,
+    status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'processing', 'ready', 'failed')),
+    error_message TEXT,
+    use_direct_context BOOLEAN,
+    created_by TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    processed_at TIMESTAMPTZ
+);
+
+-- Audit logs table
+CREATE TABLE IF NOT EXISTS audit_logs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    actor TEXT NOT NULL,
+    action TEXT NOT NULL,
+    target TEXT,
+    details JSONB,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Thread summaries table
+CREATE TABLE IF NOT EXISTS thread_summaries (
+    thread_id UUID PRIMARY KEY REFERENCES chat_threads(id) ON DELETE CASCADE,
+    summary_enc BYTEA NOT NULL,
+    version INT DEFAULT 1,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Memory facts table
+CREATE TABLE IF NOT EXISTS memory_facts (
+    fact_hash TEXT PRIMARY KEY,
+    fact_enc BYTEA NOT NULL,
+    source TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
+
+def _patch_in(stack: ExitStack, modules, name: str, new) -> None:
+    """Patch ``name`` in each of ``modules``, undone when ``stack`` closes."""
+    for module in modules:
+        stack.enter_context(patch.object(module, name, new))
+
 
 @pytest_asyncio.fixture(scope="session")
 def event_loop():
     """Override default event loop with session scope for compatibility."""
     import asyncio
-    policy = asyncio.get_event_loop_policy()
-    loop = policy.new_event_loop()
+    try:
+        # Same loop uvicorn[standard] serves the app on; faster for asyncpg/httpx I/O
+        import uvloop
+    except ImportError:
+        loop = asyncio.get_event_loop_policy().new_event_loop()
+    else:
+        loop = uvloop.new_event_loop()
     yield loop
     loop.close()
 
@@ -63,24 +240,16 @@ async def test_engine():
     """
     engine = create_async_engine(
         TEST_DATABASE_URL,
-        pool_pre_ping=True,
         echo=False,
+        # Set at connection startup, so tests don't issue SET search_path themselves
+        connect_args={"server_settings": {"search_path": f"{TEST_SCHEMA_NAME}, public"}},
     )
 
     async with engine.begin() as conn:
-        # Create control schema and members table
-        await conn.execute(text("""
-            CREATE SCHEMA IF NOT EXISTS control
-        """))
-
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS control.members (
-                org_id TEXT PRIMARY KEY,
-                schema_name TEXT NOT NULL UNIQUE,
-                vault_key_id TEXT NOT NULL,
-                created_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """))
+        # Send all DDL in one round trip: asyncpg's execute() without arguments
+        # uses the simple query protocol, which accepts several statements
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.execute(_SCHEMA_DDL)
 
         # Insert test organization
         await conn.execute(text("""
@@ -95,151 +264,6 @@ async def test_engine():
             "vault_key_id": TEST_VAULT_KEY
         })
 
-        # Create test member schema
-        await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {TEST_SCHEMA_NAME}"))
-
-        # Set search path and create tables
-        await conn.execute(text(f"SET search_path TO {TEST_SCHEMA_NAME}, public"))
-
-        # Documents table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS documents (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                title TEXT NOT NULL,
-                content_enc BYTEA NOT NULL,
-                mime TEXT DEFAULT 'text/markdown',
-                created_by TEXT NOT NULL,
-                updated_by TEXT,
-                created_at TIMESTAMPTZ DEFAULT NOW(),
-                updated_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """))
-
-        # Document versions table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS doc_versions (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
-                version INT NOT NULL,
-                content_enc BYTEA NOT NULL,
-                created_at TIMESTAMPTZ DEFAULT NOW(),
-                UNIQUE(document_id, version)
-            )
-        """))
-
-        # Chat threads table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS chat_threads (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                document_id UUID REFERENCES documents(id) ON DELETE SET NULL,
-                title TEXT,
-                created_by TEXT NOT NULL,
-                created_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """))
-
-        # Chat messages table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS chat_messages (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                thread_id UUID NOT NULL REFERENCES chat_threads(id) ON DELETE CASCADE,
-                role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
-                raw_hash TEXT,
-                text_enc BYTEA NOT NULL,
-                sanitized_enc BYTEA,
-                created_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """))
-
-        # AI requests table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS ai_requests (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                thread_id UUID NOT NULL REFERENCES chat_threads(id) ON DELETE CASCADE,
-                message_id UUID NOT NULL REFERENCES chat_messages(id) ON DELETE CASCADE,
-                scope TEXT,
-                created_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """))
-
-        # AI responses table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS ai_responses (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                request_id UUID NOT NULL REFERENCES ai_requests(id) ON DELETE CASCADE,
-                provider TEXT NOT NULL,
-                text_enc BYTEA NOT NULL,
-                input_tokens INT,
-                output_tokens INT,
-                latency_ms INT,
-                created_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """))
-
-        # AI selections table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS ai_selections (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                request_id UUID NOT NULL REFERENCES ai_requests(id) ON DELETE CASCADE,
-                provider TEXT NOT NULL,
-                selection_meta JSONB,
-                applied_to_document UUID REFERENCES documents(id) ON DELETE SET NULL,
-                created_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """))
-
-        # Uploaded files table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS uploaded_files (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                document_id UUID REFERENCES documents(id) ON DELETE SET NULL,
-                thread_id UUID REFERENCES chat_threads(id) ON DELETE CASCADE,
-                filename TEXT NOT NULL,
-                mime_type TEXT,
-                file_size_bytes BIGINT,
-                storage_path TEXT,
-                content_enc BYTEA NOT NULL,
-                status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'processing', 'ready', 'failed')),
-                error_message TEXT,
-                use_direct_context BOOLEAN,
-                created_by TEXT NOT NULL,
-                created_at TIMESTAMPTZ DEFAULT NOW(),
-                processed_at TIMESTAMPTZ
-            )
-        """))
-
-        # Audit logs table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS audit_logs (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                actor TEXT NOT NULL,
-                action TEXT NOT NULL,
-                target TEXT,
-                details JSONB,
-                created_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """))
-
-        # Thread summaries table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS thread_summaries (
-                thread_id UUID PRIMARY KEY REFERENCES chat_threads(id) ON DELETE CASCADE,
-                summary_enc BYTEA NOT NULL,
-                version INT DEFAULT 1,
-                updated_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """))
-
-        # Memory facts table
-        await conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS memory_facts (
-                fact_hash TEXT PRIMARY KEY,
-                fact_enc BYTEA NOT NULL,
-                source TEXT,
-                created_at TIMESTAMPTZ DEFAULT NOW()
-            )
-        """))
-
     yield engine
 
     # Cleanup: Drop test schema after all tests
@@ -260,63 +284,60 @@ def setup_db_patches():
             }
         return None
 
-    # Patch in all modules where fetch_member_mapping is imported
-    patches = [
-        patch("app.db.fetch_member_mapping", mock_fetch_member_mapping),
-        patch("app.routers.ai.fetch_member_mapping", mock_fetch_member_mapping),
-        patch("app.routers.threads.fetch_member_mapping", mock_fetch_member_mapping),
-        patch("app.routers.documents.fetch_member_mapping", mock_fetch_member_mapping),
-        patch("app.routers.files.fetch_member_mapping", mock_fetch_member_mapping),
-        patch("app.routers.selections.fetch_member_mapping", mock_fetch_member_mapping),
-        patch("app.routers.me.fetch_member_mapping", mock_fetch_member_mapping),
-    ]
+    @asynccontextmanager
+    async def mock_member_session(schema_name: str):
+        yield _test_session
 
-    for p in patches:
-        p.start()
+    with ExitStack() as stack:
+        _patch_in(stack, _MEMBER_MAPPING_MODULES, "fetch_member_mapping", mock_fetch_member_mapping)
+        _patch_in(stack, _MEMBER_SESSION_MODULES, "member_session", mock_member_session)
+        yield
 
-    yield
-
-    for p in patches:
-        p.stop()
 
+@pytest_asyncio.fixture(scope="session")
+async def db_connection(test_engine) -> AsyncIterator[AsyncConnection]:
+    """
+    Hold one connection and one outer transaction for the whole test session.
 
-@pytest_asyncio.fixture(autouse=True)
-async def db_session(test_engine) -> AsyncIterator[AsyncSession]:
-    """Create a database session with transaction rollback."""
+    Tests never commit to the database: each runs inside a SAVEPOINT on this
+    transaction (see db_session), and the transaction is rolled back at the end.
+    """
     async with test_engine.connect() as conn:
-        trans = await conn.begin()
+        await conn.begin()
+        yield conn
+        await conn.rollback()
 
-        AsyncSessionLocal = async_sessionmaker(
-            bind=conn,
-            expire_on_commit=False,
-        )
 
-        async with AsyncSessionLocal() as session:
-            await session.execute(text(f"SET LOCAL search_path TO {TEST_SCHEMA_NAME}, public"))
-
-            @asynccontextmanager
-            async def mock_member_session(schema_name: str):
-                yield session
-
-            # Patch in all modules where member_session is imported
-            patches = [
-                patch("app.db.member_session", mock_member_session),
-                patch("app.routers.ai.member_session", mock_member_session),
-                patch("app.routers.threads.member_session", mock_member_session),
-                patch("app.routers.documents.member_session", mock_member_session),
-                patch("app.routers.files.member_session", mock_member_session),
-                patch("app.routers.selections.member_session", mock_member_session),
-            ]
-
-            for p in patches:
-                p.start()
-
-            yield session
+@pytest_asyncio.fixture(autouse=True)
+async def db_session(db_connection) -> AsyncIterator[AsyncSession]:
+    """Create a database session inside a per-test SAVEPOINT."""
+    global _test_session
+
+    try:
+        nested = await db_connection.begin_nested()
+    except DBAPIError:
+        # An earlier test left the shared transaction aborted (e.g. overlapping
+        # statements on one connection); start a fresh one rather than failing
+        # every test after it
+        await db_connection.rollback()
+        await db_connection.begin()
+        nested = await db_connection.begin_nested()
+
+    # The session joins our savepoint: commit() in tests or routers only flushes,
+    # and rollback() rolls back to the savepoint
+    AsyncSessionLocal = async_sessionmaker(
+        bind=db_connection,
+        expire_on_commit=False,
+        join_transaction_mode="rollback_only",
+    )
 
-            for p in patches:
-                p.stop()
+    async with AsyncSessionLocal() as session:
+        # Hand this session to the member_session patch from setup_db_patches
+        _test_session = session
+        yield session
+        _test_session = None
 
-            await trans.rollback()
+    await nested.rollback()
 
 # ============================================================================
 # Authentication Fixtures
@@ -340,86 +361,90 @@ def override_get_identity(test_identity):
 # HTTP Client Fixtures
 # ============================================================================
 
+@pytest_asyncio.fixture(scope="session")
+async def asgi_client() -> AsyncIterator[AsyncClient]:
+    """Create one AsyncClient over the FastAPI app, shared by every test."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    ) as client:
+        yield client
+
+
 @pytest_asyncio.fixture
-async def async_client(override_get_identity, db_session) -> AsyncIterator[AsyncClient]:
+async def async_client(override_get_identity, db_session, asgi_client) -> AsyncIterator[AsyncClient]:
     """
-    Create an async HTTP client for testing FastAPI endpoints.
+    Provide the async HTTP client for testing FastAPI endpoints.
 
     This fixture:
-    1. Creates AsyncClient with ASGITransport
+    1. Reuses the session-wide AsyncClient with ASGITransport
     2. Overrides get_identity dependency with test identity
     3. Yields client for test
-    4. Cleans up after test
+    4. Clears cookies after test so no state leaks into the next one
     """
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test"
-    ) as client:
-        yield client
+    yield asgi_client
+    asgi_client.cookies.clear()
 
 
 # ============================================================================
 # Vault Mocking Fixtures
 # ============================================================================
 
-@pytest.fixture(autouse=True)
+_MOCK_CIPHERTEXT_PREFIX = b"vault:v1:encrypted_"
+
+
+async def _mock_encrypt(key_path: str, plaintext: str, context=None) -> bytes:
+    return _MOCK_CIPHERTEXT_PREFIX + plaintext.encode("utf-8")
+
+
+async def _mock_decrypt(key_path: str, ciphertext_bytes: bytes, context=None) -> str:
+    # Remove "vault:v1:encrypted_" prefix
+    if ciphertext_bytes.startswith(_MOCK_CIPHERTEXT_PREFIX):
+        return ciphertext_bytes[len(_MOCK_CIPHERTEXT_PREFIX):].decode("utf-8")
+    # Fallback for different format
+    return ciphertext_bytes.decode("utf-8")
+
+
+@pytest.fixture(scope="session", autouse=True)
 def mock_vault():
     """
-    Mock Vault encrypt_text and decrypt_text functions.
+    Mock Vault encrypt_text and decrypt_text functions for the whole session.
+
+    The patch targets and side effects never change between tests, so they are
+    installed once; reset_vault_mocks clears the call history before each test.
 
     Returns predictable encrypted values for testing:
-    - encrypt_text returns b"encrypted_" + original.encode()
-    - decrypt_text removes b"encrypted_" prefix and decodes
+    - encrypt_text returns b"vault:v1:encrypted_" + original.encode()
+    - decrypt_text removes the b"vault:v1:encrypted_" prefix and decodes
     """
-    async def mock_encrypt(key_path: str, plaintext: str, context=None) -> bytes:
-        return b"vault:v1:encrypted_" + plaintext.encode("utf-8")
-
-    async def mock_decrypt(key_path: str, ciphertext_bytes: bytes, context=None) -> str:
-        # Remove "vault:v1:encrypted_" prefix
-        prefix = b"vault:v1:encrypted_"
-        if ciphertext_bytes.startswith(prefix):
-            return ciphertext_bytes[len(prefix):].decode("utf-8")
-        # Fallback for different format
-        return ciphertext_bytes.decode("utf-8")
-
     # Create shared mocks that will be used across all patches
-    mock_enc = AsyncMock(side_effect=mock_encrypt)
-    mock_dec = AsyncMock(side_effect=mock_decrypt)
+    mock_enc = AsyncMock(side_effect=_mock_encrypt)
+    mock_dec = AsyncMock(side_effect=_mock_decrypt)
 
     # Patch in all modules where vault functions are imported, using the same mock objects
-    patches = [
-        patch("app.crypto.vault.encrypt_text", mock_enc),
-        patch("app.crypto.vault.decrypt_text", mock_dec),
-        patch("app.routers.ai.encrypt_text", mock_enc),
-        patch("app.routers.ai.decrypt_text", mock_dec),
-        patch("app.routers.threads.encrypt_text", mock_enc),
-        patch("app.routers.threads.decrypt_text", mock_dec),
-        patch("app.routers.documents.encrypt_text", mock_enc),
-        patch("app.routers.documents.decrypt_text", mock_dec),
-        patch("app.routers.files.encrypt_text", mock_enc),
-        patch("app.routers.files.decrypt_text", mock_dec),
-        patch("app.routers.selections.encrypt_text", mock_enc),
-        patch("app.routers.selections.decrypt_text", mock_dec),
-    ]
+    with ExitStack() as stack:
+        _patch_in(stack, _VAULT_MODULES, "encrypt_text", mock_enc)
+        _patch_in(stack, _VAULT_MODULES, "decrypt_text", mock_dec)
 
-    for p in patches:
-        p.start()
+        # Return the shared Mock objects
+        yield {"encrypt": mock_enc, "decrypt": mock_dec}
 
-    # Return the shared Mock objects
-    yield {"encrypt": mock_enc, "decrypt": mock_dec}
 
-    for p in patches:
-        p.stop()
+@pytest.fixture(autouse=True)
+def reset_vault_mocks(mock_vault):
+    """Clear Vault mock call records so assertions only see the current test."""
+    mock_vault["encrypt"].reset_mock()
+    mock_vault["decrypt"].reset_mock()
 
 
 # ============================================================================
 # RAG Service Mocking Fixtures
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_rag_service():
     """
-    Mock RAG service for file processing tests.
+    Mock RAG service for file processing tests, built once per session.
 
     Returns an AsyncMock with common methods:
     - upload_document: Returns number of chunks (5 by default)
@@ -455,6 +480,10 @@ def mock_rag_service():
 @pytest.fixture
 def mock_get_rag_service(mock_rag_service):
     """Mock the get_rag_service function to return mock RAG service."""
+    # Drop call records and side effects left by earlier tests; the default
+    # return values configured above are kept
+    mock_rag_service.reset_mock(side_effect=True)
+
     with patch("app.services.azure_rag_service.get_rag_service", return_value=mock_rag_service):
         yield mock_rag_service
 
@@ -463,46 +492,51 @@ def mock_get_rag_service(mock_rag_service):
 # LLM Client Mocking Fixtures
 # ============================================================================
 
+# Canned provider results returned by the fanout mock
+_LLM_RESPONSES = (
+    {
+        "provider": "openai",
+        "text": "OpenAI draft response",
+        "input_tokens": 100,
+        "output_tokens": 50,
+        "latency_ms": 500,
+        "ok": True
+    },
+    {
+        "provider": "anthropic",
+        "text": "Anthropic draft response",
+        "input_tokens": 100,
+        "output_tokens": 50,
+        "latency_ms": 600,
+        "ok": True
+    },
+    {
+        "provider": "xai",
+        "text": "xAI draft response",
+        "input_tokens": 100,
+        "output_tokens": 50,
+        "latency_ms": 450,
+        "ok": True
+    },
+)
+
+
+async def _mock_fanout(messages):
+    return list(_LLM_RESPONSES)
+
+
 @pytest.fixture
 def mock_llm_clients():
     """
     Mock LLM client responses for AI endpoint tests.
 
     Returns mock responses for OpenAI, Anthropic, and xAI providers.
+    fanout_with_history is replaced by a plain coroutine function; tests that
+    need call assertions patch it themselves.
     """
-    mock_responses = [
-        {
-            "provider": "openai",
-            "text": "OpenAI draft response",
-            "input_tokens": 100,
-            "output_tokens": 50,
-            "latency_ms": 500,
-            "ok": True
-        },
-        {
-            "provider": "anthropic",
-            "text": "Anthropic draft response",
-            "input_tokens": 100,
-            "output_tokens": 50,
-            "latency_ms": 600,
-            "ok": True
-        },
-        {
-            "provider": "xai",
-            "text": "xAI draft response",
-            "input_tokens": 100,
-            "output_tokens": 50,
-            "latency_ms": 450,
-            "ok": True
-        }
-    ]
-
-    async def mock_fanout(messages):
-        return mock_responses
-
     # Patch where the function is imported (in the router module)
-    with patch("app.routers.ai.fanout_with_history", side_effect=mock_fanout):
-        yield mock_responses
+    with patch("app.routers.ai.fanout_with_history", _mock_fanout):
+        yield list(_LLM_RESPONSES)
 
 
 # ============================================================================
@@ -561,7 +595,7 @@ def create_test_document(db_session, mock_vault):
         })
 
         doc_id = result.scalar_one()
-        await db_session.commit()
+        await db_session.flush()
         return str(doc_id)
 
     return _create_document
@@ -594,12 +628,46 @@ def create_test_thread(db_session):
         })
 
         thread_id = result.scalar_one()
-        await db_session.commit()
+        await db_session.flush()
         return str(thread_id)
 
     return _create_thread
 
 
+@pytest.fixture
+def create_test_threads(db_session):
+    """
+    Factory fixture to create several chat threads with a single INSERT.
+
+    Usage:
+        thread_ids = await create_test_threads(
+            [f"Thread {i}" for i in range(10)]
+        )
+    """
+    async def _create_threads(
+        titles: list[str],
+        document_id: str = None,
+        created_by: str = TEST_USER_ID
+    ) -> list[str]:
+        params = {"document_id": document_id, "created_by": created_by}
+        rows = []
+        for i, title in enumerate(titles):
+            params[f"title_{i}"] = title
+            rows.append(f"(:document_id, :title_{i}, :created_by)")
+
+        result = await db_session.execute(text(
+            "INSERT INTO chat_threads (document_id, title, created_by) VALUES "
+            + ", ".join(rows)
+            + " RETURNING id"
+        ), params)
+
+        thread_ids = [str(thread_id) for thread_id in result.scalars()]
+        await db_session.flush()
+        return thread_ids
+
+    return _create_threads
+
+
 @pytest.fixture
 def create_test_message(db_session, mock_vault):
     """
@@ -618,8 +686,8 @@ def create_test_message(db_session, mock_vault):
     ) -> str:
         from app.crypto.vault import encrypt_text
 
+        # Sanitized text is the same as the raw text in tests, so one ciphertext serves both
         text_enc = await encrypt_text(TEST_VAULT_KEY, message_text)
-        sanitized_enc = await encrypt_text(TEST_VAULT_KEY, message_text)  # Same for test
 
         result = await db_session.execute(text("""
             INSERT INTO chat_messages (thread_id, role, text_enc, sanitized_enc)
@@ -629,11 +697,11 @@ def create_test_message(db_session, mock_vault):
             "thread_id": thread_id,
             "role": role,
             "text_enc": text_enc,
-            "sanitized_enc": sanitized_enc
+            "sanitized_enc": text_enc
         })
 
         message_id = result.scalar_one()
-        await db_session.commit()
+        await db_session.flush()
         return str(message_id)
 
     return _create_message
@@ -306,12 +306,11 @@ class TestListThreads:
 
     @pytest.mark.asyncio
     async def test_list_threads_returns_all(
-        self, async_client: AsyncClient, create_test_thread
+        self, async_client: AsyncClient, create_test_threads
     ):
         """Should return all threads."""
         # Create 3 threads
-        for i in range(3):
-            await create_test_thread(title=f"Thread {i}")
+        await create_test_threads([f"Thread {i}" for i in range(3)])
 
         response = await async_client.get("/threads")
 
@@ -321,12 +320,11 @@ class TestListThreads:
 
     @pytest.mark.asyncio
     async def test_list_threads_pagination_limit(
-        self, async_client: AsyncClient, create_test_thread
+        self, async_client: AsyncClient, create_test_threads
     ):
         """Should respect limit parameter."""
         # Create 10 threads
-        for i in range(10):
-            await create_test_thread(title=f"Thread {i}")
+        await create_test_threads([f"Thread {i}" for i in range(10)])
 
         response = await async_client.get("/threads?limit=5")
 
@@ -336,12 +334,11 @@ class TestListThreads:
 
     @pytest.mark.asyncio
     async def test_list_threads_pagination_offset(
-        self, async_client: AsyncClient, create_test_thread
+        self, async_client: AsyncClient, create_test_threads
     ):
         """Should respect offset parameter."""
         # Create threads with distinct titles
-        for i in range(5):
-            await create_test_thread(title=f"Thread {i:02d}")
+        await create_test_threads([f"Thread {i:02d}" for i in range(5)])
 
         # Get first 2
         response1 = await async_client.get("/threads?limit=2&offset=0")
@@ -0,0 +1,69 @@
+"""
+Tests for LLM response post-processing utilities.
+
+This module tests expanding "unchanged" placeholders in drafts with
+sections from the current document.
+"""
+
+import pytest
+from app.utils.document_processor import expand_unchanged_sections
+
+
+CURRENT_DOC = (
+    "## 1. Term\n\n"
+    "Twelve months.\n\n"
+    "## 2. Rent\n\n"
+    "Monthly.\n\n"
+    "## 3. Notices\n\n"
+    "In writing.\n"
+)
+
+
+class TestExpandUnchangedSections:
+    """Tests for expand_unchanged_sections."""
+
+    def test_expands_numbered_placeholder(self):
+        """Should replace a numbered placeholder with those sections."""
+        draft = "[Sections 1-2 remain unchanged]\n\n## 3. Notices\n\nBy email.\n"
+
+        result = expand_unchanged_sections(draft, CURRENT_DOC)
+
+        assert result.startswith("## 1. Term\n\nTwelve months.\n\n## 2. Rent\n\nMonthly.")
+        assert "remain unchanged" not in result
+
+    def test_multiple_fallback_placeholders_use_draft_positions(self):
+        """Should pick sections for each unparseable placeholder by its offset in the draft."""
+        draft = (
+            "Intro paragraph text.\n\n"
+            "[Earlier text unchanged]\n\n"
+            "[Other text unchanged]\n"
+        )
+
+        result = expand_unchanged_sections(draft, CURRENT_DOC)
+
+        # The first placeholder sits before section 2 starts, the second before
+        # section 3; the first expansion must not push the second past it
+        assert result == (
+            "Intro paragraph text.\n\n"
+            "## 1. Term\n\nTwelve months.\n\n"
+            "## 1. Term\n\nTwelve months.\n\n## 2. Rent\n\nMonthly.\n"
+        )
+
+    def test_fallback_after_numbered_placeholder_counts_its_expansion(self):
+        """Should measure a fallback placeholder past an earlier numbered expansion."""
+        draft = "[Section 2 remains unchanged]\n\n[Other text unchanged]\n"
+
+        result = expand_unchanged_sections(draft, CURRENT_DOC)
+
+        # Numbered placeholders expand first; section 2 is shorter than its
+        # placeholder, which moves the fallback back before section 2 starts
+        assert result == (
+            "## 2. Rent\n\nMonthly.\n\n"
+            "## 1. Term\n\nTwelve months.\n"
+        )
+
+    def test_draft_without_placeholders_is_unchanged(self):
+        """Should return the draft as-is when it has no placeholders."""
+        draft = "## 1. Term\n\nSix months.\n"
+
+        assert expand_unchanged_sections(draft, CURRENT_DOC) == draft
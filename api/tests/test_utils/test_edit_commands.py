@@ -0,0 +1,117 @@
+"""
+Tests for structured edit command utilities.
+
+This module tests applying edit plans (replace, insert, delete, append)
+to a document.
+"""
+
+import pytest
+from app.utils.edit_commands import (
+    EditCommand,
+    EditPlan,
+    apply_edits,
+)
+
+
+def _plan(*edits: EditCommand) -> EditPlan:
+    return EditPlan(reasoning="test", edits=list(edits))
+
+
+DOC = (
+    "# Agreement\n\n"
+    "## 1. Term\n\n"
+    "The term is twelve months.\n\n"
+    "## 2. Rent\n\n"
+    "Rent is payable monthly.\n"
+)
+
+
+class TestApplyEdits:
+    """Tests for apply_edits."""
+
+    def test_replace(self):
+        """Should replace the anchor text with the new content."""
+        result = apply_edits(DOC, _plan(EditCommand(
+            type="replace",
+            anchor="twelve months",
+            content="twenty-four months",
+        )))
+
+        assert "The term is twenty-four months." in result
+        assert "twelve months" not in result
+
+    def test_insert_after_and_before(self):
+        """Should insert content around the anchor separated by blank lines."""
+        result = apply_edits(DOC, _plan(
+            EditCommand(type="insert_after", anchor="The term is twelve months.", content="Renewal is automatic."),
+            EditCommand(type="insert_before", anchor="## 2. Rent", content="## 1A. Renewal"),
+        ))
+
+        assert "The term is twelve months.\n\nRenewal is automatic." in result
+        assert "## 1A. Renewal\n\n## 2. Rent" in result
+
+    def test_delete_removes_all_occurrences(self):
+        """Should remove every occurrence of the anchor."""
+        doc = "alpha beta alpha gamma alpha"
+
+        result = apply_edits(doc, _plan(EditCommand(type="delete", anchor="alpha ")))
+
+        assert result == "beta gamma alpha"
+
+    def test_append(self):
+        """Should append content to the end of the document."""
+        result = apply_edits(DOC, _plan(EditCommand(type="append", content="## 3. Signatures")))
+
+        assert result.endswith("Rent is payable monthly.\n\n## 3. Signatures")
+
+    def test_multiple_edits_out_of_order(self):
+        """Should apply edits regardless of their order in the plan."""
+        result = apply_edits(DOC, _plan(
+            EditCommand(type="replace", anchor="payable monthly", content="payable quarterly"),
+            EditCommand(type="replace", anchor="twelve months", content="six months"),
+        ))
+
+        assert "The term is six months." in result
+        assert "Rent is payable quarterly." in result
+
+    def test_overlapping_edit_is_skipped(self):
+        """Should skip an edit whose anchor was consumed by an earlier edit."""
+        result = apply_edits(DOC, _plan(
+            EditCommand(type="replace", anchor="The term is twelve months.", content="The term is one year."),
+            EditCommand(type="replace", anchor="twelve", content="six"),
+        ))
+
+        assert "The term is one year." in result
+        assert "six" not in result
+
+    def test_missing_anchor_is_ignored(self):
+        """Should leave the document unchanged when the anchor is not found."""
+        result = apply_edits(DOC, _plan(EditCommand(
+            type="replace",
+            anchor="Nonexistent clause text",
+            content="Anything",
+        )))
+
+        assert result == DOC
+
+    def test_fuzzy_anchor_with_different_whitespace(self):
+        """Should locate anchors whose whitespace differs from the document."""
+        result = apply_edits(DOC, _plan(EditCommand(
+            type="insert_before",
+            anchor="Rent  is\npayable",
+            content="Note:",
+        )))
+
+        assert "Note:\n\nRent is payable monthly." in result
+
+    def test_fuzzy_anchor_in_document_with_length_changing_case(self):
+        """Should still match case-insensitively when lowercasing changes a word's length."""
+        doc = "Rent is due İ\n\nLate fees apply."
+
+        result = apply_edits(doc, _plan(EditCommand(
+            type="insert_before",
+            anchor="late  FEES",
+            content="Note:",
+        )))
+
+        assert result == "Rent is due İ\n\nNote:\n\nLate fees apply."
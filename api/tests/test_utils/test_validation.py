@@ -47,6 +47,19 @@ class TestPlaceholderDetection:
         errors = [i for i in issues if i.severity == "error"]
         assert any("Template placeholder" in err.message for err in errors)
 
+    def test_detects_insert_and_todo_before_remain_bracket(self):
+        """Should still flag [INSERT ...] / [TODO ...] when a later 'remain ... [x]' follows."""
+        doc = (
+            "Landlord: [INSERT LANDLORD NAME]. "
+            "The deposit terms remain as in clause 4 [see Annex A]."
+        )
+        errors = [i for i in validate_completeness(doc) if i.severity == "error"]
+        assert any("Template placeholder" in err.message for err in errors)
+
+        doc = "Signed on [TODO: date] - all other provisions remain unchanged (see [Schedule 1])."
+        errors = [i for i in validate_completeness(doc) if i.severity == "error"]
+        assert any("TODO placeholder" in err.message for err in errors)
+
     def test_detects_remains_unchanged_text(self):
         """Should detect 'remains unchanged' text patterns."""
         doc = "Clause 1: New text\n\nClause 2 remains unchanged\n\nClause 3: More text"
@@ -346,6 +359,20 @@ More content
         assert "Title 1" in headings
         assert "Title 2" in headings
 
+    def test_extract_section_headings_ignores_rules_after_blank_lines(self):
+        """Should not treat a rule below a blank line as a heading."""
+        doc = """## Terms ##
+
+---
+---
+
+Closing text
+"""
+
+        headings = _extract_section_headings(doc)
+
+        assert headings == ["Terms"]
+
     def test_extract_section_headings_with_numbering(self):
         """Should normalize numbered section titles."""
         doc = """# 1. Introduction
@@ -369,6 +396,17 @@ More content
         assert _is_placeholder_document(placeholder2) is True
         assert _is_placeholder_document(real_doc) is False
 
+    def test_issue_location_from_span(self):
+        """Should build an issue's location from its span when first read."""
+        text = "Intro text\n\n[TODO: fill in]\n\nClosing text"
+        start = text.index("[TODO")
+        end = start + len("[TODO: fill in]")
+
+        issue = ValidationIssue(severity="error", message="TODO", span=(start, end), text=text)
+
+        assert issue.span == (start, end)
+        assert issue.location == _extract_context(text, start, end)
+
 
 class TestValidationReportFormatting:
     """Tests for validation report formatting."""